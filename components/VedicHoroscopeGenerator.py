@@ -3,9 +3,9 @@ Vedic Horoscope Generator Component
 DRY implementation for integration across the Astrologer app
 """
 
+import html
 import swisseph as swe
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import pandas as pd
 import streamlit as st
 from datetime import datetime
 
@@ -43,11 +43,13 @@ class VedicHoroscopeGenerator:
         {'name': 'Pisces', 'symbol': '♓', 'element': 'Water', 'quality': 'Mutable'}
     ]
     
-    HOUSE_POSITIONS_NORTH = [
+    # House positions scaled for the enhanced chart's larger diamond, as plain floats ready for drawing
+    HOUSE_POSITIONS_NORTH_SCALED = tuple((x * 1.2, y * 1.2) for x, y in (
         (0, 0.75), (0.75, 0.75), (0.75, 0), (0.75, -0.75),
         (0, -0.75), (-0.75, -0.75), (-0.75, 0), (-0.75, 0.75),
         (-0.375, 0.375), (0.375, 0.375), (0.375, -0.375), (-0.375, -0.375)
-    ]
+    ))
+    SVG_POINT_SCALE = 12 * 72 / 4.4  # points per chart unit, sized as a 12in chart spanning 4.4 units
 
     def __init__(self):
         """Initialize Vedic Horoscope generator with error handling"""
@@ -102,10 +104,14 @@ class VedicHoroscopeGenerator:
         return swe.julday(year, month, day, decimal_hour)
 
     def calculate_comprehensive_positions(self, jd):
-        """Calculate all planetary positions with detailed information"""
+        """Calculate all planetary positions with detailed information, cached per Julian day"""
         if not self.initialized:
             return None
-            
+        
+        return comprehensive_positions_for_julian_day(round(jd, 6))
+
+    def _calculate_comprehensive_positions_uncached(self, jd):
+        """Calculate all planetary positions with detailed information"""
         positions = {}
         
         for planet_name, planet_data in self.PLANETS.items():
@@ -162,54 +168,6 @@ class VedicHoroscopeGenerator:
         
         return positions
 
-    def create_enhanced_north_chart(self, positions, chart_title="Vedic Horoscope Chart"):
-        """Create enhanced North Indian chart with symbols and colors"""
-        fig, ax = plt.subplots(1, 1, figsize=(12, 12))
-        ax.set_xlim(-2.2, 2.2)
-        ax.set_ylim(-2.2, 2.2)
-        ax.set_aspect('equal')
-        ax.axis('off')
-        
-        # Enhanced diamond with gradient effect
-        diamond_coords = [(0, 1.8), (1.8, 0), (0, -1.8), (-1.8, 0)]
-        diamond = patches.Polygon(diamond_coords, linewidth=3, 
-                                 edgecolor='#2E4A8B', facecolor='#F0F8FF', alpha=0.9)
-        ax.add_patch(diamond)
-        
-        # Enhanced internal lines
-        ax.plot([0, 0], [-1.8, 1.8], color='#2E4A8B', linewidth=2)
-        ax.plot([-1.8, 1.8], [0, 0], color='#2E4A8B', linewidth=2)
-        ax.plot([-1.8, 1.8], [-1.8, 1.8], color='#2E4A8B', linewidth=1.5)
-        ax.plot([-1.8, 1.8], [1.8, -1.8], color='#2E4A8B', linewidth=1.5)
-        
-        # Group planets by houses
-        houses_with_planets = self._group_by_houses_enhanced(positions)
-        
-        # Draw houses with enhanced styling
-        for i, (x, y) in enumerate(self.HOUSE_POSITIONS_NORTH):
-            house_num = i + 1
-            
-            # Scale positions for larger diamond
-            x_scaled, y_scaled = x * 1.2, y * 1.2
-            
-            # House number with background
-            ax.text(x_scaled, y_scaled + 0.2, str(house_num), 
-                   ha='center', va='center', fontsize=14, fontweight='bold', 
-                   color='white', bbox=dict(boxstyle="circle,pad=0.3", 
-                   facecolor='#2E4A8B', alpha=0.8))
-            
-            # Planets in house with symbols and colors
-            if house_num in houses_with_planets:
-                self._draw_enhanced_planets(ax, x_scaled, y_scaled - 0.25, 
-                                          houses_with_planets[house_num])
-        
-        # Enhanced title
-        ax.text(0, 2.1, chart_title, ha='center', va='center',
-               fontsize=18, fontweight='bold', color='#2E4A8B')
-        
-        plt.tight_layout()
-        return fig
-
     def _group_by_houses_enhanced(self, positions):
         """Enhanced house grouping with planetary data"""
         houses_with_planets = {}
@@ -231,44 +189,79 @@ class VedicHoroscopeGenerator:
         
         return houses_with_planets
 
-    def _draw_enhanced_planets(self, ax, x, y, planets_list):
-        """Draw planets with names and colors"""
+    def _enhanced_planet_labels(self, x, y, planets_list):
+        """Yield (x, y, text, color, fontsize) for each planet label in a house"""
         if len(planets_list) == 1:
             planet = planets_list[0]
+            yield x, y, f"{planet['name']}{'(R)' if planet['retrograde'] else ''}", planet['color'], 12
+            return
+        
+        # Multiple planets - arrange in a small grid
+        cols = 2 if len(planets_list) <= 4 else 3
+        for i, planet in enumerate(planets_list):
+            row = i // cols
+            col = i % cols
+            offset_x = (col - (cols-1)/2) * 0.2  # Increased spacing for names
+            offset_y = (row - 0.5) * 0.15        # Increased vertical spacing
+            
             planet_text = f"{planet['name']}{'(R)' if planet['retrograde'] else ''}"
-            ax.text(x, y, planet_text, ha='center', va='center',
-                   fontsize=12, color=planet['color'], fontweight='bold')
-        else:
-            # Multiple planets - arrange in a small grid
-            cols = 2 if len(planets_list) <= 4 else 3
-            for i, planet in enumerate(planets_list):
-                row = i // cols
-                col = i % cols
-                offset_x = (col - (cols-1)/2) * 0.2  # Increased spacing for names
-                offset_y = (row - 0.5) * 0.15        # Increased vertical spacing
-                
-                planet_text = f"{planet['name']}{'(R)' if planet['retrograde'] else ''}"
-                ax.text(x + offset_x, y + offset_y, planet_text, 
-                       ha='center', va='center', fontsize=10, 
-                       color=planet['color'], fontweight='bold')
+            yield x + offset_x, y + offset_y, planet_text, planet['color'], 10
+
+    def create_enhanced_north_chart_svg(self, positions, chart_title="Vedic Horoscope Chart"):
+        """
+        Create the enhanced North Indian chart as an SVG string
+        Drawn by the browser, so no plotting library is needed
+        """
+        # Font sizes and stroke widths are given in points; one chart unit is SVG_POINT_SCALE points
+        pt = 1 / self.SVG_POINT_SCALE
+        houses_with_planets = self._group_by_houses_enhanced(positions)
+        
+        # SVG's y axis points down, so chart y coordinates are negated
+        parts = [
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="-2.2 -2.2 4.4 4.4" width="100%" '
+            'font-family="sans-serif" font-weight="bold" text-anchor="middle" dominant-baseline="central">',
+            f'<polygon points="0,-1.8 1.8,0 0,1.8 -1.8,0" fill="#F0F8FF" fill-opacity="0.9" '
+            f'stroke="#2E4A8B" stroke-width="{3 * pt:.4f}"/>',
+            f'<path d="M0,-1.8V1.8M-1.8,0H1.8" stroke="#2E4A8B" stroke-width="{2 * pt:.4f}"/>',
+            f'<path d="M-1.8,1.8L1.8,-1.8M-1.8,-1.8L1.8,1.8" stroke="#2E4A8B" stroke-width="{1.5 * pt:.4f}"/>'
+        ]
+        
+        for house_num, (x, y) in enumerate(self.HOUSE_POSITIONS_NORTH_SCALED, start=1):
+            parts.append(
+                f'<circle cx="{x:.3f}" cy="{-(y + 0.2):.3f}" r="{12 * pt:.4f}" fill="#2E4A8B" fill-opacity="0.8"/>'
+                f'<text x="{x:.3f}" y="{-(y + 0.2):.3f}" font-size="{14 * pt:.4f}" fill="white">{house_num}</text>'
+            )
+            for label_x, label_y, planet_text, color, fontsize in self._enhanced_planet_labels(
+                    x, y - 0.25, houses_with_planets.get(house_num, ())):
+                parts.append(
+                    f'<text x="{label_x:.3f}" y="{-label_y:.3f}" font-size="{fontsize * pt:.4f}" '
+                    f'fill="{color}">{html.escape(planet_text)}</text>'
+                )
+        
+        # Titles may carry a literal "\\n" as the line break
+        title_lines = chart_title.replace('\\n', '\n').split('\n')
+        first_y = -2.1 - (len(title_lines) - 1) * 0.06
+        parts.extend(
+            f'<text x="0" y="{first_y + i * 0.12:.3f}" font-size="{18 * pt:.4f}" fill="#2E4A8B">{html.escape(line)}</text>'
+            for i, line in enumerate(title_lines)
+        )
+        parts.append('</svg>')
+        return "".join(parts)
 
     def create_detailed_report(self, positions):
-        """Create detailed planetary report for Streamlit"""
+        """Create detailed planetary report for Streamlit as a DataFrame built column by column"""
         if not positions:
             return None
-            
-        report_data = []
-        for planet_name, data in positions.items():
-            report_data.append({
-                'Planet': planet_name,
-                'Sign': f"{data['sign_symbol']} {data['sign_name']}",
-                'Degree': f"{data['degree_in_sign']:.2f}°",
-                'Longitude': f"{data['longitude']:.4f}°",
-                'Status': '(R) Retrograde' if data.get('retrograde') else 'Direct',
-                'Speed': f"{data.get('speed', 0):.4f}°/day"
-            })
         
-        return report_data
+        report = pd.DataFrame.from_dict(positions, orient='index')
+        return pd.DataFrame({
+            'Planet': report.index,
+            'Sign': report['sign_symbol'] + ' ' + report['sign_name'],
+            'Degree': report['degree_in_sign'].map('{:.2f}°'.format),
+            'Longitude': report['longitude'].map('{:.4f}°'.format),
+            'Status': report['retrograde'].map({True: '(R) Retrograde', False: 'Direct'}),
+            'Speed': report['speed'].fillna(0).map('{:.4f}°/day'.format)
+        }).reset_index(drop=True)
 
     def get_quick_summary(self, positions):
         """Get a quick summary for dashboard display"""
@@ -294,6 +287,21 @@ class VedicHoroscopeGenerator:
         
         return max(elements.items(), key=lambda x: x[1])[0] if elements else 'Unknown'
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def comprehensive_positions_for_julian_day(jd):
+    """Planetary positions are a pure function of the Julian day, so reruns reuse them"""
+    return get_vedic_horoscope_generator()._calculate_comprehensive_positions_uncached(jd)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def render_kundali_chart_svg(chart_key, title, _positions):
+    """Build the chart SVG once per distinct chart; the browser renders it, so no matplotlib is involved"""
+    return get_vedic_horoscope_generator().create_enhanced_north_chart_svg(_positions, title)
+
+@st.cache_resource
+def get_vedic_horoscope_generator():
+    """Shared generator instance - it holds no per-user state, so one per process is enough"""
+    return VedicHoroscopeGenerator()
+
 def create_kundali_widget(birth_data=None):
     """
     Create a Vedic Horoscope widget for use in other pages
@@ -303,7 +311,7 @@ def create_kundali_widget(birth_data=None):
         st.info("📊 Enter birth details to generate Vedic Horoscope chart")
         return None
     
-    calculator = VedicHoroscopeGenerator()
+    calculator = get_vedic_horoscope_generator()
     if not calculator.is_ready():
         st.error("Vedic Horoscope generator not available")
         return None
@@ -347,8 +355,11 @@ def create_kundali_widget(birth_data=None):
         if positions:
             # Display chart
             chart_title = f"Vedic Horoscope Chart\\n{day}/{month}/{year}"
-            fig = calculator.create_enhanced_north_chart(positions, chart_title)
-            st.pyplot(fig)
+            # Only sign placement and retrograde status are drawn, so they key the cached render
+            chart_key = tuple(
+                (planet, data['sign_index'], data['retrograde']) for planet, data in positions.items()
+            )
+            st.image(render_kundali_chart_svg(chart_key, chart_title, positions), use_container_width=True)
             
             # Quick summary
             summary = calculator.get_quick_summary(positions)
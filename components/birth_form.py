@@ -1,5 +1,5 @@
 import streamlit as st
-from src.astrology.prediction_engine import generate_quick_prediction
+from src.astrology.prediction_engine import stream_combined_prediction, birth_details_key
 from src.utils.common import (
     get_date_range_config,
     create_time_from_components,
@@ -133,20 +133,29 @@ def render_birth_form():
             if st.button("🔮 Generate Quick Prediction", key="generate_prediction_btn"):
                 birth_data, selected_time, location_data = process_birth_data()
                 if birth_data:
-                    # Use location string for prediction (for compatibility)
-                    place_string = location_data.get('place_string', f"{city}, {country}")
-                    
-                    # Generate AI prediction with spinner
-                    with st.spinner("🔮 Generating your personalized prediction..."):
-                        prediction = generate_quick_prediction(birth_date, selected_time, place_string)
-                        set_session_value(SESSION_KEYS['QUICK_PREDICTION'], prediction)
-                        set_session_value(SESSION_KEYS['PREDICTIONS_GENERATED'], True)
-                    
                     st.success(f"✅ Birth data saved! Time: {birth_hour:02d}:{birth_minute:02d}")
                     
-                    # Display the prediction
+                    # Quick and detailed predictions come from one AI call. The quick part is
+                    # shown as it is written; the detailed text is kept for the Birth Chart page
                     st.subheader("🔮 Your Quick Prediction")
-                    st.markdown(prediction)
+                    prediction = detailed_prediction = None
+                    try:
+                        quick_stream, detailed_stream = stream_combined_prediction(birth_data)
+                        # write_stream returns a list rather than a str when nothing was written
+                        result = st.write_stream(quick_stream)
+                        prediction = (result if isinstance(result, str) else "".join(map(str, result))).strip()
+                        with st.spinner("🔮 Preparing your detailed analysis for the Birth Chart page..."):
+                            detailed_prediction = "".join(detailed_stream).strip()
+                    except Exception as e:
+                        st.error(f"Unable to generate response at this time. Error: {str(e)}")
+                    
+                    if prediction:
+                        set_session_value(SESSION_KEYS['QUICK_PREDICTION'], prediction)
+                        set_session_value(SESSION_KEYS['PREDICTIONS_GENERATED'], True)
+                    set_session_value(SESSION_KEYS['DETAILED_PREDICTION'], {
+                        'key': birth_details_key(birth_data),
+                        'text': detailed_prediction
+                    } if detailed_prediction else None)
                     
         # Show navigation hint after saving
         current_birth_data = get_session_value(SESSION_KEYS['BIRTH_DATA'], {})
@@ -1,6 +1,6 @@
 import streamlit as st
 from src.astrology.prediction_engine import (
-    get_chat_response,
+    stream_chat_response,
     get_chat_history,
     add_to_chat_history,
     clear_chat_history
@@ -48,25 +48,23 @@ def render_interactive_chat(birth_data):
     with col_submit:
         if st.button("🔮 Get Answer", type="primary", disabled=not user_question.strip()):
             if user_question.strip():
-                with st.spinner("🔮 Consulting the stars..."):
-                    # Get AI response
-                    response = get_chat_response(birth_data, user_question)
-                    
-                    # Add to chat history
-                    add_to_chat_history(user_question, response)
-                    
-                    # Show the response
-                    st.success("✨ Response received!")
-                    with st.container():
-                        st.write(f"**🙋 Your Question:** {user_question}")
-                        st.write(f"**🔮 Astrologer's Answer:**")
-                        st.markdown(response)
-                    
-                    # Clear the input by incrementing counter (creates new widget)
-                    st.session_state.input_counter += 1
-                    
-                    # Rerun to update chat history display
-                    st.rerun()
+                with st.container():
+                    st.write(f"**🙋 Your Question:** {user_question}")
+                    st.write(f"**🔮 Astrologer's Answer:**")
+                    # Paint the answer as it arrives instead of waiting for the full response
+                    response = st.write_stream(stream_chat_response(birth_data, user_question))
+                
+                # Add to chat history
+                add_to_chat_history(user_question, response)
+                
+                # Show the response
+                st.success("✨ Response received!")
+                
+                # Clear the input by incrementing counter (creates new widget)
+                st.session_state.input_counter += 1
+                
+                # Rerun to update chat history display
+                st.rerun()
     
     with col_clear:
         if st.button("🔄 Clear Chat"):
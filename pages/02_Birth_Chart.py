@@ -6,7 +6,8 @@ from src.utils.page_utils import (
     CHART_FEATURES
 )
 from components.VedicHoroscopeGenerator import create_kundali_widget
-from src.astrology.prediction_engine import generate_detailed_prediction
+from src.astrology.prediction_engine import generate_detailed_prediction, birth_details_key
+from src.utils.common import get_session_value, SESSION_KEYS
 
 def render_chart_summary(positions, birth_data):
     """Generate and display chart summary with strong/weak planets and chart owner"""
@@ -168,7 +169,12 @@ def render_detailed_chart_analysis(birth_data):
     
     with st.spinner("🔮 Generating comprehensive chart analysis..."):
         try:
-            detailed_analysis = generate_detailed_prediction(birth_data)
+            # Reuse the analysis generated alongside the quick prediction for the same birth details
+            stored = get_session_value(SESSION_KEYS['DETAILED_PREDICTION'])
+            if stored and stored['key'] == birth_details_key(birth_data):
+                detailed_analysis = stored['text']
+            else:
+                detailed_analysis = generate_detailed_prediction(birth_data)
             if detailed_analysis:
                 st.markdown(detailed_analysis)
             else:
@@ -219,11 +225,11 @@ def render_birth_chart_content(birth_data):
             render_detailed_chart_analysis(birth_data)
             
             with st.expander("📋 Detailed Planetary Positions"):
-                from components.VedicHoroscopeGenerator import VedicHoroscopeGenerator
-                calculator = VedicHoroscopeGenerator()
+                from components.VedicHoroscopeGenerator import get_vedic_horoscope_generator
+                calculator = get_vedic_horoscope_generator()
                 report_data = calculator.create_detailed_report(positions)
-                if report_data:
-                    st.dataframe(report_data, use_container_width=True)
+                if report_data is not None:
+                    st.dataframe(report_data, use_container_width=True, hide_index=True)
     else:
         render_coming_soon_section(
             f"📊 {chart_type}", 
@@ -11,7 +11,7 @@ from src.utils.page_utils import (
     render_coming_soon_section,
     DASHA_FEATURES
 )
-from src.calculations.dasha_calculator import VimshottariDashaCalculator
+from src.calculations.dasha_calculator import get_dasha_calculator
 from datetime import datetime, timedelta
 
 def render_current_dasha_info(dasha_data):
@@ -67,25 +67,25 @@ def render_dasha_timeline(timeline_data):
         # Process all periods in timeline
         for period in timeline_data:
             # Determine status
-            if period.get('is_current', False):
+            if period.is_current:
                 status = "🔴 Current"
-                duration = f"{period['elapsed_years']:.1f} / {period['period_years']} years"
-                progress = f"{(period['elapsed_years']/period['period_years']*100):.1f}%"
-                time_info = f"{period['remaining_years']:.1f} years remaining"
-            elif period.get('is_past', False):
+                duration = f"{period.elapsed_years:.1f} / {period.period_years} years"
+                progress = f"{(period.elapsed_years/period.period_years*100):.1f}%"
+                time_info = f"{period.remaining_years:.1f} years remaining"
+            elif period.is_past:
                 status = "⚪ Past"
-                duration = f"{period['period_years']} years"
+                duration = f"{period.period_years} years"
                 progress = "Completed"
-                days_ago = (current_date - period['end_date']).days
+                days_ago = (current_date - period.end_date).days
                 if days_ago > 0:
                     time_info = f"Ended {days_ago} days ago"
                 else:
                     time_info = "Recently ended"
             else:
                 status = "🔵 Future"
-                duration = f"{period['period_years']} years"
+                duration = f"{period.period_years} years"
                 progress = "Not started"
-                days_until = (period['start_date'] - current_date).days
+                days_until = (period.start_date - current_date).days
                 if days_until > 0:
                     time_info = f"Starts in {days_until} days"
                 else:
@@ -93,9 +93,9 @@ def render_dasha_timeline(timeline_data):
             
             table_data.append({
                 "Status": status,
-                "Planet": period['planet'],
-                "Start Date": period['start_date'].strftime('%d %b %Y'),
-                "End Date": period['end_date'].strftime('%d %b %Y'),
+                "Planet": period.planet,
+                "Start Date": period.start_date.strftime('%d %b %Y'),
+                "End Date": period.end_date.strftime('%d %b %Y'),
                 "Duration": duration,
                 "Progress": progress,
                 "Time Info": time_info
@@ -107,8 +107,8 @@ def render_dasha_timeline(timeline_data):
         # Show summary statistics
         col1, col2, col3 = st.columns(3)
         
-        past_count = sum(1 for p in timeline_data if p.get('is_past', False))
-        current_count = sum(1 for p in timeline_data if p.get('is_current', False))
+        past_count = sum(1 for p in timeline_data if p.is_past)
+        current_count = sum(1 for p in timeline_data if p.is_current)
         future_count = len(timeline_data) - past_count - current_count
         
         with col1:
@@ -125,7 +125,7 @@ def render_dasha_timeline(timeline_data):
         # Simple fallback
         st.write("Basic timeline display:")
         for i, period in enumerate(timeline_data[:10]):
-            st.write(f"{i+1}. {period['planet']} - {period['start_date'].strftime('%Y')} to {period['end_date'].strftime('%Y')}")
+            st.write(f"{i+1}. {period.planet} - {period.start_date.strftime('%Y')} to {period.end_date.strftime('%Y')}")
 
 def render_dasha_content(birth_data):
     """Render dasha analysis specific content"""
@@ -179,14 +179,17 @@ def render_dasha_content(birth_data):
     
     # Calculate Dasha information
     try:
-        calculator = VimshottariDashaCalculator()
+        calculator = get_dasha_calculator()
         
         with st.spinner("🔮 Calculating your Dasha periods..."):
-            # Get current dasha
-            current_dasha = calculator.get_current_dasha(birth_data['date'], birth_data['time'])
-            
             # Get complete life timeline from birth to 100 years
             timeline = calculator.get_complete_life_dasha_timeline(birth_data['date'], birth_data['time'])
+            
+            # Get current dasha - read from the timeline, computed separately only beyond 100 years
+            current_dasha = (
+                calculator.current_dasha_from_timeline(timeline)
+                or calculator.get_current_dasha(birth_data['date'], birth_data['time'])
+            )
         
         if current_dasha and timeline:
             # Render current dasha information
@@ -1,9 +1,20 @@
 import streamlit as st
 from src.utils.page_utils import create_standard_page_layout
 from src.calculations.planetary_afflictions import PlanetaryAfflictionsCalculator
-from datetime import datetime, timedelta
+from datetime import timedelta
+from operator import itemgetter
 import pandas as pd
 
+# Multiplying by the reciprocal avoids a float divide per day-to-year conversion
+_DAYS_TO_YEARS = 1.0 / 365.25
+
+# Ages and durations stay numeric in the timeline tables; units are added at display time
+PERIOD_COLUMN_CONFIG = {
+    'Start Age': st.column_config.NumberColumn('Start Age', format='%.1f years'),
+    'End Age': st.column_config.NumberColumn('End Age', format='%.1f years'),
+    'Duration': st.column_config.NumberColumn('Duration', format='%.1f years')
+}
+
 def render_current_afflictions(current_afflictions):
     """Render currently active afflictions"""
     if not current_afflictions:
@@ -14,31 +25,28 @@ def render_current_afflictions(current_afflictions):
     
     for affliction in current_afflictions:
         with st.expander(f"🔴 {affliction['name']} - {affliction.get('phase', 'Active')}", expanded=True):
-            col1, col2, col3 = st.columns(3)
+            cols = st.columns(3)
             
-            with col1:
-                st.metric(
-                    "Current Age",
-                    f"{affliction.get('start_age', 'N/A')} years",
-                    f"Started"
-                )
+            cols[0].metric(
+                "Current Age",
+                f"{affliction.get('start_age', 'N/A')} years",
+                f"Started"
+            )
             
-            with col2:
-                if 'remaining_days' in affliction:
-                    remaining_years = round(affliction['remaining_days'] / 365.25, 1)
-                    st.metric(
-                        "Remaining",
-                        f"{remaining_years} years",
-                        f"{affliction['remaining_days']} days"
-                    )
-            
-            with col3:
-                st.metric(
-                    "Intensity",
-                    affliction.get('intensity', 'Medium'),
-                    f"Duration: {affliction.get('duration_years', 'N/A')} years"
+            if 'remaining_days' in affliction:
+                remaining_years = round(affliction['remaining_days'] * _DAYS_TO_YEARS, 1)
+                cols[1].metric(
+                    "Remaining",
+                    f"{remaining_years} years",
+                    f"{affliction['remaining_days']} days"
                 )
             
+            cols[2].metric(
+                "Intensity",
+                affliction.get('intensity', 'Medium'),
+                f"Duration: {affliction.get('duration_years', 'N/A')} years"
+            )
+            
             # Effects and remedies
             st.write(f"**🎯 Effects:** {affliction.get('effects', 'General challenging period')}")
             st.write(f"**🔮 Remedies:** {affliction.get('remedies', 'Spiritual practices and charity')}")
@@ -56,175 +64,176 @@ def render_upcoming_afflictions(upcoming_afflictions):
     
     for affliction in upcoming_afflictions:
         with st.expander(f"🟡 {affliction['name']} - Starts {affliction['start_date'].strftime('%B %Y')}"):
-            col1, col2, col3 = st.columns(3)
+            cols = st.columns(3)
             
-            with col1:
-                st.metric(
-                    "Starts At Age",
-                    f"{affliction.get('start_age', 'N/A')} years",
-                    f"{affliction['start_date'].strftime('%b %d, %Y')}"
-                )
-            
-            with col2:
-                if 'days_until_start' in affliction:
-                    years_until = round(affliction['days_until_start'] / 365.25, 1)
-                    st.metric(
-                        "Time Until Start",
-                        f"{years_until} years",
-                        f"{affliction['days_until_start']} days"
-                    )
+            cols[0].metric(
+                "Starts At Age",
+                f"{affliction.get('start_age', 'N/A')} years",
+                f"{affliction['start_date'].strftime('%b %d, %Y')}"
+            )
             
-            with col3:
-                st.metric(
-                    "Duration",
-                    f"{affliction.get('duration_years', 'N/A')} years",
-                    f"Ends at age {affliction.get('end_age', 'N/A')}"
+            if 'days_until_start' in affliction:
+                years_until = round(affliction['days_until_start'] * _DAYS_TO_YEARS, 1)
+                cols[1].metric(
+                    "Time Until Start",
+                    f"{years_until} years",
+                    f"{affliction['days_until_start']} days"
                 )
             
+            cols[2].metric(
+                "Duration",
+                f"{affliction.get('duration_years', 'N/A')} years",
+                f"Ends at age {affliction.get('end_age', 'N/A')}"
+            )
+            
             st.write(f"**🎯 Expected Effects:** {affliction.get('effects', 'Challenging period ahead')}")
             st.write(f"**🔮 Recommended Remedies:** {affliction.get('remedies', 'Start spiritual practices early')}")
 
-def render_lifetime_afflictions_timeline(timeline):
-    """Render complete lifetime afflictions timeline"""
-    if not timeline:
-        st.error("❌ Unable to calculate afflictions timeline")
-        return
-    
-    st.subheader("🎯 Complete Lifetime Afflictions Timeline (Birth to 100 Years)")
-    
-    # Summary statistics
-    summary = timeline.get('summary', {})
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Sade Sathi Periods",
-            summary.get('total_sade_sathi_periods', 0),
-            f"{summary.get('total_sade_sathi_years', 0)} years total"
-        )
-    
-    with col2:
-        st.metric(
-            "Ashtama Shani Periods", 
-            summary.get('total_ashtama_periods', 0),
-            f"{summary.get('total_ashtama_years', 0)} years total"
-        )
-    
-    with col3:
-        kuja_status = "Present" if summary.get('lifetime_kuja_dosha', False) else "Absent"
-        st.metric(
-            "Kuja Dosha",
-            kuja_status,
-            "Lifetime effect"
-        )
-    
-    with col4:
-        kala_sarpa_status = "Present" if summary.get('lifetime_kala_sarpa', False) else "Absent"
-        st.metric(
-            "Kala Sarpa Dosha",
-            kala_sarpa_status,
-            "Lifetime effect"
-        )
-    
-    # Year span summary table
-    st.subheader("📅 Affliction Period Year Spans")
+def build_timeline_tables(sade_sathi_periods, ashtama_shani_periods):
+    """Build the year span and detailed timeline DataFrames for the lifetime view"""
+    if not sade_sathi_periods and not ashtama_shani_periods:
+        return None, None
     
-    # Create year span table
+    # Build the year span table and the detailed timeline in a single pass
     year_spans = []
+    all_periods = []
     
-    # Add Sade Sathi year spans
-    for i, period in enumerate(timeline.get('sade_sathi_periods', []), 1):
+    # Add Sade Sathi periods
+    for i, period in enumerate(sade_sathi_periods, 1):
         start_date_str = period['start_date'].strftime('%b %Y')
         end_date_str = period['end_date'].strftime('%b %Y')
+        common = {
+            'Start Age': period.get('start_age'),
+            'End Age': period.get('end_age'),
+            'Duration': period.get('duration_years'),
+            'Intensity': period.get('intensity', 'Medium')
+        }
         
         year_spans.append({
             'Affliction Type': 'Sade Sathi',
             'Period #': f"Period {period.get('cycle_number', i)}",
             'Phase': period.get('phase', 'Unknown'),
             'Date Range': f"{start_date_str} to {end_date_str}",
-            'Start Age': f"{period.get('start_age', 'N/A')} years",
-            'End Age': f"{period.get('end_age', 'N/A')} years",
-            'Duration': f"{period.get('duration_years', 'N/A')} years",
-            'Intensity': period.get('intensity', 'Medium')
+            **common,
+            '_sort_age': period.get('start_age', 0)
+        })
+        all_periods.append({
+            'Affliction': f"Sade Sathi ({period.get('phase', 'Unknown')})",
+            'Start Date': start_date_str,
+            'End Date': end_date_str,
+            **common,
+            'Key Effects': period.get('effects', 'Challenging period')[:60] + "...",
+            '_sort_date': period['start_date']
         })
     
-    # Add Ashtama Shani year spans
-    for i, period in enumerate(timeline.get('ashtama_shani_periods', []), 1):
+    # Add Ashtama Shani periods
+    for i, period in enumerate(ashtama_shani_periods, 1):
         start_date_str = period['start_date'].strftime('%b %Y')
         end_date_str = period['end_date'].strftime('%b %Y')
+        common = {
+            'Start Age': period.get('start_age'),
+            'End Age': period.get('end_age'),
+            'Duration': period.get('duration_years'),
+            'Intensity': period.get('intensity', 'Very High')
+        }
         
         year_spans.append({
             'Affliction Type': 'Ashtama Shani',
             'Period #': f"Period {period.get('cycle_number', i)}",
             'Phase': 'Complete Period',
             'Date Range': f"{start_date_str} to {end_date_str}",
-            'Start Age': f"{period.get('start_age', 'N/A')} years",
-            'End Age': f"{period.get('end_age', 'N/A')} years",
-            'Duration': f"{period.get('duration_years', 'N/A')} years",
-            'Intensity': period.get('intensity', 'Very High')
+            **common,
+            '_sort_age': period.get('start_age', 0)
+        })
+        all_periods.append({
+            'Affliction': 'Ashtama Shani',
+            'Start Date': start_date_str,
+            'End Date': end_date_str,
+            **common,
+            'Key Effects': period.get('effects', 'Major transformations')[:60] + "...",
+            '_sort_date': period['start_date']
         })
     
-    # Sort by start age
-    year_spans.sort(key=lambda x: float(x['Start Age'].replace(' years', '')) if x['Start Age'] != 'N/A years' else 0)
+    # Sort by start age / start date
+    year_spans.sort(key=itemgetter('_sort_age'))
+    all_periods.sort(key=itemgetter('_sort_date'))
     
-    if year_spans:
-        df_spans = pd.DataFrame(year_spans)
-        st.dataframe(df_spans, use_container_width=True, hide_index=True)
-        
-        # Add interpretation
-        st.info(f"""
-        **📊 Lifetime Saturn Afflictions Overview:**
-        - **Sade Sathi**: {len(timeline.get('sade_sathi_periods', []))} periods × 7.5 years = {summary.get('total_sade_sathi_years', 0)} years total
-        - **Ashtama Shani**: {len(timeline.get('ashtama_shani_periods', []))} periods × 2.5 years = {summary.get('total_ashtama_years', 0)} years total
-        - **Total Saturn Affliction Years**: {summary.get('total_sade_sathi_years', 0) + summary.get('total_ashtama_years', 0)} years out of 100-year lifespan
-        - **Life Impact**: Approximately {round((summary.get('total_sade_sathi_years', 0) + summary.get('total_ashtama_years', 0)) / 100 * 100, 1)}% of lifetime under major Saturn influences
-        
-        **Note:** Every person experiences exactly 4 Sade Sathi periods (every ~29.5 years) and multiple Ashtama Shani periods during their lifetime.
-        """)
-    else:
-        st.info("ℹ️ No major Saturn affliction periods found in lifetime timeline")
+    df_spans = pd.DataFrame(year_spans).drop(columns='_sort_age')
+    df_periods = pd.DataFrame(all_periods).drop(columns='_sort_date')
+    return df_spans, df_periods
+
+@st.cache_data(show_spinner=False)
+def get_afflictions_timeline_with_tables(birth_date):
+    """Calculate the lifetime timeline and its display tables, cached per birth date"""
+    timeline = PlanetaryAfflictionsCalculator().get_complete_afflictions_timeline(birth_date)
+    if not timeline:
+        return timeline, None, None
     
-    # Detailed timeline table
-    st.subheader("🗓️ Detailed Timeline")
+    df_spans, df_periods = build_timeline_tables(
+        timeline.get('sade_sathi_periods', []),
+        timeline.get('ashtama_shani_periods', [])
+    )
+    return timeline, df_spans, df_periods
+
+def render_lifetime_afflictions_timeline(timeline, df_spans, df_periods):
+    """Render complete lifetime afflictions timeline from prebuilt tables"""
+    if not timeline:
+        st.error("❌ Unable to calculate afflictions timeline")
+        return
     
-    # Combine all periods for timeline
-    all_periods = []
+    st.subheader("🎯 Complete Lifetime Afflictions Timeline (Birth to 100 Years)")
     
-    # Add Sade Sathi periods
-    for period in timeline.get('sade_sathi_periods', []):
-        all_periods.append({
-            'Affliction': f"Sade Sathi ({period.get('phase', 'Unknown')})",
-            'Start Date': period['start_date'].strftime('%b %Y'),
-            'End Date': period['end_date'].strftime('%b %Y'),
-            'Start Age': f"{period.get('start_age', 'N/A')} years",
-            'End Age': f"{period.get('end_age', 'N/A')} years",
-            'Duration': f"{period.get('duration_years', 'N/A')} years",
-            'Intensity': period.get('intensity', 'Medium'),
-            'Key Effects': period.get('effects', 'Challenging period')[:60] + "..."
-        })
+    # Summary statistics
+    summary = timeline.get('summary', {})
     
-    # Add Ashtama Shani periods
-    for period in timeline.get('ashtama_shani_periods', []):
-        all_periods.append({
-            'Affliction': 'Ashtama Shani',
-            'Start Date': period['start_date'].strftime('%b %Y'),
-            'End Date': period['end_date'].strftime('%b %Y'),
-            'Start Age': f"{period.get('start_age', 'N/A')} years",
-            'End Age': f"{period.get('end_age', 'N/A')} years",
-            'Duration': f"{period.get('duration_years', 'N/A')} years",
-            'Intensity': period.get('intensity', 'Very High'),
-            'Key Effects': period.get('effects', 'Major transformations')[:60] + "..."
-        })
+    kuja_status = "Present" if summary.get('lifetime_kuja_dosha', False) else "Absent"
+    kala_sarpa_status = "Present" if summary.get('lifetime_kala_sarpa', False) else "Absent"
     
-    # Sort by start date
-    all_periods.sort(key=lambda x: datetime.strptime(x['Start Date'], '%b %Y'))
+    cols = st.columns(4)
+    cols[0].metric(
+        "Sade Sathi Periods",
+        summary.get('total_sade_sathi_periods', 0),
+        f"{summary.get('total_sade_sathi_years', 0)} years total"
+    )
+    cols[1].metric(
+        "Ashtama Shani Periods", 
+        summary.get('total_ashtama_periods', 0),
+        f"{summary.get('total_ashtama_years', 0)} years total"
+    )
+    cols[2].metric("Kuja Dosha", kuja_status, "Lifetime effect")
+    cols[3].metric("Kala Sarpa Dosha", kala_sarpa_status, "Lifetime effect")
     
-    if all_periods:
-        df = pd.DataFrame(all_periods)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-    else:
+    sade_sathi_periods = timeline.get('sade_sathi_periods', [])
+    ashtama_shani_periods = timeline.get('ashtama_shani_periods', [])
+    
+    # Nothing to tabulate
+    if df_spans is None:
+        st.subheader("📅 Affliction Period Year Spans")
+        st.info("ℹ️ No major Saturn affliction periods found in lifetime timeline")
+        st.subheader("🗓️ Detailed Timeline")
         st.info("ℹ️ No major planetary affliction periods found in lifetime")
+        return
+    
+    # Year span summary table
+    st.subheader("📅 Affliction Period Year Spans")
+    
+    st.dataframe(df_spans, use_container_width=True, hide_index=True, column_config=PERIOD_COLUMN_CONFIG)
+    
+    # Add interpretation
+    st.info(f"""
+    **📊 Lifetime Saturn Afflictions Overview:**
+    - **Sade Sathi**: {len(sade_sathi_periods)} periods × 7.5 years = {summary.get('total_sade_sathi_years', 0)} years total
+    - **Ashtama Shani**: {len(ashtama_shani_periods)} periods × 2.5 years = {summary.get('total_ashtama_years', 0)} years total
+    - **Total Saturn Affliction Years**: {summary.get('total_sade_sathi_years', 0) + summary.get('total_ashtama_years', 0)} years out of 100-year lifespan
+    - **Life Impact**: Approximately {round((summary.get('total_sade_sathi_years', 0) + summary.get('total_ashtama_years', 0)) / 100 * 100, 1)}% of lifetime under major Saturn influences
+    
+    **Note:** Every person experiences exactly 4 Sade Sathi periods (every ~29.5 years) and multiple Ashtama Shani periods during their lifetime.
+    """)
+    
+    # Detailed timeline table
+    st.subheader("🗓️ Detailed Timeline")
+    
+    st.dataframe(df_periods, use_container_width=True, hide_index=True, column_config=PERIOD_COLUMN_CONFIG)
 
 def render_birth_chart_doshas(kuja_dosha, kala_sarpa_dosha):
     """Render birth chart doshas (Kuja Dosha and Kala Sarpa Dosha)"""
@@ -292,8 +301,8 @@ def render_transit_content(birth_data):
         with st.spinner("🔮 Calculating planetary afflictions from birth to 100 years..."):
             calculator = PlanetaryAfflictionsCalculator()
             
-            # Get complete timeline
-            complete_timeline = calculator.get_complete_afflictions_timeline(birth_date)
+            # Get complete timeline along with its display tables
+            complete_timeline, df_spans, df_periods = get_afflictions_timeline_with_tables(birth_date)
             
             # Get current afflictions
             current_afflictions = calculator.get_current_afflictions(birth_date)
@@ -302,13 +311,11 @@ def render_transit_content(birth_data):
             upcoming_afflictions = calculator.get_upcoming_afflictions(birth_date, years_ahead=5)
         
         # Display current afflictions
-        st.subheader("🔴 Currently Active Afflictions")
+        st.markdown("### 🔴 Currently Active Afflictions")
         render_current_afflictions(current_afflictions)
         
-        st.markdown("---")
-        
-        # Display upcoming afflictions
-        st.subheader("🟡 Upcoming Afflictions (Next 5 Years)")
+        # Separator and heading in one delta
+        st.markdown("---\n### 🟡 Upcoming Afflictions (Next 5 Years)")
         render_upcoming_afflictions(upcoming_afflictions)
         
         st.markdown("---")
@@ -321,12 +328,10 @@ def render_transit_content(birth_data):
         st.markdown("---")
         
         # Display complete timeline
-        render_lifetime_afflictions_timeline(complete_timeline)
-        
-        st.markdown("---")
+        render_lifetime_afflictions_timeline(complete_timeline, df_spans, df_periods)
         
         # Educational content
-        st.subheader("📚 Understanding Planetary Afflictions")
+        st.markdown("---\n### 📚 Understanding Planetary Afflictions")
         
         tab1, tab2, tab3, tab4 = st.tabs(["🪐 Sade Sathi", "🔥 Ashtama Shani", "⚔️ Kuja Dosha", "🐍 Kala Sarpa"])
         
@@ -1,46 +1,21 @@
 import streamlit as st
+import string
 from src.utils.page_utils import (
     create_standard_page_layout,
     render_standard_disclaimer,
     REMEDY_CATEGORIES
 )
-from src.utils.common import generate_ai_response
+from src.utils.common import stream_ai_model, split_stream_sections, normalize_birth_data
 
-def generate_personalized_mantras(birth_data):
-    """Generate AI-powered personalized mantra recommendations"""
-    if not birth_data or not birth_data.get('date'):
-        return None
-    
-    # Extract comprehensive location information
-    location_info = birth_data.get('location', {})
-    if isinstance(location_info, dict):
-        city = location_info.get('city', '')
-        state = location_info.get('state', '')
-        country = location_info.get('country', '')
-        latitude = location_info.get('latitude')
-        longitude = location_info.get('longitude')
-        coordinates = location_info.get('coordinates', {})
-        if not latitude and coordinates:
-            latitude = coordinates.get('latitude')
-            longitude = coordinates.get('longitude')
-        
-        location_str = f"{city}, {state}, {country}" if state else f"{city}, {country}"
-        if latitude and longitude:
-            location_str += f" (Lat: {latitude:.4f}°, Long: {longitude:.4f}°)"
-    else:
-        location_str = birth_data.get('place', 'Not specified')
-    
-    timezone_offset = birth_data.get('timezone_offset', 0)
-    
-    prompt = f"""
-    As a Vedic astrology expert, provide personalized mantra recommendations for someone born on:
-    
-    Date: {birth_data['date']}
-    Time: {birth_data.get('time', 'Not specified')}
-    Place: {location_str}
-    Timezone Offset: {timezone_offset:+.1f} hours from UTC
-    
-    Based on the precise birth location coordinates and timezone, please provide:
+# Prompt pieces are built once at import; only the birth details are substituted per call
+BIRTH_DETAILS_PROMPT = """    
+    Date: $date
+    Time: $time
+    Place: $place
+    Timezone Offset: $timezone_offset hours from UTC
+    
+"""
+MANTRAS_PROMPT_SECTION = """    Based on the precise birth location coordinates and timezone, please provide:
     1. **Primary Mantra**: One main mantra based on their likely birth planetary influences considering geographical location
     2. **Daily Mantras**: 3-4 mantras for daily recitation suited to their birth time and location
     3. **Specific Purpose Mantras**: Mantras for career, health, relationships, and wealth
@@ -50,44 +25,7 @@ def generate_personalized_mantras(birth_data):
     Format as clear sections with Sanskrit mantras and their English meanings.
     Focus on traditional Vedic mantras and their specific benefits based on precise birth coordinates.
     """
-    
-    return generate_ai_response(prompt)
-
-def generate_personalized_gemstones(birth_data):
-    """Generate AI-powered personalized gemstone recommendations"""
-    if not birth_data or not birth_data.get('date'):
-        return None
-    
-    # Extract comprehensive location information
-    location_info = birth_data.get('location', {})
-    if isinstance(location_info, dict):
-        city = location_info.get('city', '')
-        state = location_info.get('state', '')
-        country = location_info.get('country', '')
-        latitude = location_info.get('latitude')
-        longitude = location_info.get('longitude')
-        coordinates = location_info.get('coordinates', {})
-        if not latitude and coordinates:
-            latitude = coordinates.get('latitude')
-            longitude = coordinates.get('longitude')
-        
-        location_str = f"{city}, {state}, {country}" if state else f"{city}, {country}"
-        if latitude and longitude:
-            location_str += f" (Lat: {latitude:.4f}°, Long: {longitude:.4f}°)"
-    else:
-        location_str = birth_data.get('place', 'Not specified')
-    
-    timezone_offset = birth_data.get('timezone_offset', 0)
-    
-    prompt = f"""
-    As a Vedic gemstone expert, provide personalized gemstone recommendations for someone born on:
-    
-    Date: {birth_data['date']}
-    Time: {birth_data.get('time', 'Not specified')}
-    Place: {location_str}
-    Timezone Offset: {timezone_offset:+.1f} hours from UTC
-    
-    Based on the precise birth location coordinates and timezone, please provide:
+GEMSTONES_PROMPT_SECTION = """    Based on the precise birth location coordinates and timezone, please provide:
     1. **Primary Gemstone**: Main gemstone recommendation based on likely birth chart considering geographical location
     2. **Alternative Gemstones**: 2-3 alternative options suited to their birth coordinates
     3. **Metal Recommendations**: Best metals for setting (gold, silver, copper, etc.) based on planetary influences
@@ -100,44 +38,7 @@ def generate_personalized_gemstones(birth_data):
     Always recommend professional consultation before wearing precious gemstones.
     Consider the geographical and cultural context of their birth location.
     """
-    
-    return generate_ai_response(prompt)
-
-def generate_personalized_rituals(birth_data):
-    """Generate AI-powered personalized ritual recommendations"""
-    if not birth_data or not birth_data.get('date'):
-        return None
-    
-    # Extract comprehensive location information
-    location_info = birth_data.get('location', {})
-    if isinstance(location_info, dict):
-        city = location_info.get('city', '')
-        state = location_info.get('state', '')
-        country = location_info.get('country', '')
-        latitude = location_info.get('latitude')
-        longitude = location_info.get('longitude')
-        coordinates = location_info.get('coordinates', {})
-        if not latitude and coordinates:
-            latitude = coordinates.get('latitude')
-            longitude = coordinates.get('longitude')
-        
-        location_str = f"{city}, {state}, {country}" if state else f"{city}, {country}"
-        if latitude and longitude:
-            location_str += f" (Lat: {latitude:.4f}°, Long: {longitude:.4f}°)"
-    else:
-        location_str = birth_data.get('place', 'Not specified')
-    
-    timezone_offset = birth_data.get('timezone_offset', 0)
-    
-    prompt = f"""
-    As a Vedic ritual expert, provide personalized ritual recommendations for someone born on:
-    
-    Date: {birth_data['date']}
-    Time: {birth_data.get('time', 'Not specified')}
-    Place: {location_str}
-    Timezone Offset: {timezone_offset:+.1f} hours from UTC
-    
-    Based on the precise birth location coordinates and timezone, please provide:
+RITUALS_PROMPT_SECTION = """    Based on the precise birth location coordinates and timezone, please provide:
     1. **Daily Rituals**: Morning and evening practices suited to their birth influences and local sunrise/sunset times
     2. **Weekly Rituals**: Specific day-based practices considering their geographical location
     3. **Seasonal Rituals**: Practices for different times of the year based on their hemisphere and climate
@@ -150,44 +51,7 @@ def generate_personalized_rituals(birth_data):
     Include both simple daily practices and more elaborate remedial ceremonies.
     Consider local customs and seasonal variations based on their geographical location.
     """
-    
-    return generate_ai_response(prompt)
-
-def generate_personalized_donations(birth_data):
-    """Generate AI-powered personalized donation recommendations"""
-    if not birth_data or not birth_data.get('date'):
-        return None
-    
-    # Extract comprehensive location information
-    location_info = birth_data.get('location', {})
-    if isinstance(location_info, dict):
-        city = location_info.get('city', '')
-        state = location_info.get('state', '')
-        country = location_info.get('country', '')
-        latitude = location_info.get('latitude')
-        longitude = location_info.get('longitude')
-        coordinates = location_info.get('coordinates', {})
-        if not latitude and coordinates:
-            latitude = coordinates.get('latitude')
-            longitude = coordinates.get('longitude')
-        
-        location_str = f"{city}, {state}, {country}" if state else f"{city}, {country}"
-        if latitude and longitude:
-            location_str += f" (Lat: {latitude:.4f}°, Long: {longitude:.4f}°)"
-    else:
-        location_str = birth_data.get('place', 'Not specified')
-    
-    timezone_offset = birth_data.get('timezone_offset', 0)
-    
-    prompt = f"""
-    As a Vedic charity expert, provide personalized donation recommendations for someone born on:
-    
-    Date: {birth_data['date']}
-    Time: {birth_data.get('time', 'Not specified')}
-    Place: {location_str}
-    Timezone Offset: {timezone_offset:+.1f} hours from UTC
-    
-    Based on the precise birth location coordinates and timezone, please provide:
+DONATIONS_PROMPT_SECTION = """    Based on the precise birth location coordinates and timezone, please provide:
     1. **Planetary Donations**: Specific items to donate based on likely planetary influences considering their birth location
     2. **Day-wise Donations**: What to donate on different days of the week, adapted to their timezone
     3. **Beneficial Recipients**: Who to give donations to for maximum spiritual benefit, including local organizations
@@ -200,8 +64,82 @@ def generate_personalized_donations(birth_data):
     Include both material donations and acts of service.
     Consider local customs, economic conditions, and cultural context based on their geographical location.
     """
+
+# All four remedy sections in one request; the response is split on the marker line
+REMEDY_SECTION_MARKER = "===SECTION==="
+REMEDIES_PROMPT_TEMPLATE = string.Template(
+    """
+    As a Vedic astrology expert, provide personalized remedy recommendations for someone born on:
+"""
+    + BIRTH_DETAILS_PROMPT
+    + f"""    Write exactly four sections in this order: Mantras, Gemstones, Rituals, Donations.
+    Put a line containing only {REMEDY_SECTION_MARKER} between consecutive sections and nowhere else.
+    
+    SECTION 1 - MANTRAS
+"""
+    + MANTRAS_PROMPT_SECTION
+    + "\n    SECTION 2 - GEMSTONES\n"
+    + GEMSTONES_PROMPT_SECTION
+    + "\n    SECTION 3 - RITUALS\n"
+    + RITUALS_PROMPT_SECTION
+    + "\n    SECTION 4 - DONATIONS\n"
+    + DONATIONS_PROMPT_SECTION
+)
+
+def build_location_context(birth_data):
+    """Get the (location string, timezone offset) used by the remedies prompt"""
+    if 'location_str' not in birth_data:
+        # Birth data saved before normalization was added
+        birth_data = normalize_birth_data(birth_data)
+    return birth_data['location_str'], birth_data['timezone_offset']
+
+def build_remedies_prompt(birth_data):
+    """Build the single prompt that asks for all four remedy sections at once"""
+    if not birth_data or not birth_data.get('date'):
+        return None
     
-    return generate_ai_response(prompt)
+    location_str, timezone_offset = build_location_context(birth_data)
+    
+    prompt = REMEDIES_PROMPT_TEMPLATE.substitute(
+        date=birth_data['date'],
+        time=birth_data.get('time', 'Not specified'),
+        place=location_str,
+        timezone_offset=f"{timezone_offset:+.1f}"
+    )
+    
+    return prompt
+
+def stream_remedies_response(prompt, outcome):
+    """Stream the remedies response, showing any error inline; outcome['complete'] is set only on a clean finish"""
+    try:
+        yield from stream_ai_model(prompt)
+    except Exception as e:
+        yield f"\n\nUnable to generate recommendations at this time. Error: {str(e)}"
+        return
+    outcome['complete'] = True
+
+def birth_data_cache_key(birth_data):
+    """Hashable tuple of the birth details the remedy prompts depend on"""
+    return (
+        birth_data.get('date'),
+        birth_data.get('time'),
+        birth_data.get('place'),
+        birth_data.get('latitude'),
+        birth_data.get('longitude'),
+        birth_data.get('timezone_offset', 0)
+    )
+
+@st.cache_resource(ttl=86400)
+def get_remedy_recommendation_store():
+    """Finished remedy recommendations keyed by birth details, shared across sessions for a day"""
+    return {}
+
+def render_recommendation(source, label):
+    """Show a stored recommendation or stream a fresh one into the page; returns the full text"""
+    text = source if isinstance(source, str) else st.write_stream(source)
+    if not text:
+        st.error(f"❌ Unable to generate {label} recommendations. Please try again.")
+    return text
 
 def render_remedies_content(birth_data):
     """Render AI-powered remedies specific content"""
@@ -226,6 +164,17 @@ def render_remedies_content(birth_data):
     
     st.success("✨ Generating personalized remedial recommendations based on your birth chart...")
     
+    # Stored recommendations render instantly. Otherwise one multi-section prompt is
+    # streamed and split on the section marker, so the tabs fill in order as it arrives.
+    birth_key = birth_data_cache_key(birth_data)
+    store = get_remedy_recommendation_store()
+    recommendations = store.get(birth_key)
+    outcome = {}
+    sources = recommendations or split_stream_sections(
+        stream_remedies_response(build_remedies_prompt(birth_data), outcome), 4, REMEDY_SECTION_MARKER
+    )
+    results = []
+    
     # Remedy categories with AI-powered content
     tab1, tab2, tab3, tab4 = st.tabs([
         "🔮 Mantras",
@@ -236,54 +185,70 @@ def render_remedies_content(birth_data):
     
     with tab1:
         st.subheader("🔮 Mantra Recommendations")
-        with st.spinner("🔮 Analyzing your planetary influences for mantra suggestions..."):
-            mantra_recommendations = generate_personalized_mantras(birth_data)
-        
-        if mantra_recommendations:
-            st.markdown(mantra_recommendations)
-        else:
-            st.error("❌ Unable to generate mantra recommendations. Please try again.")
+        results.append(render_recommendation(sources[0], "mantra"))
         
         st.info("💡 **Important**: Mantras are most effective when chanted with devotion and consistency. Start with shorter sessions and gradually increase duration.")
     
     with tab2:
         st.subheader("💎 Gemstone Analysis")
-        with st.spinner("💎 Calculating your gemstone compatibility..."):
-            gemstone_recommendations = generate_personalized_gemstones(birth_data)
-        
-        if gemstone_recommendations:
-            st.markdown(gemstone_recommendations)
-        else:
-            st.error("❌ Unable to generate gemstone recommendations. Please try again.")
+        results.append(render_recommendation(sources[1], "gemstone"))
         
         st.warning("⚠️ **Critical**: Always consult a qualified gemologist and astrologer before wearing any precious gemstone. Incorrect gemstones can have adverse effects.")
     
     with tab3:
         st.subheader("🕉️ Ritual Practices")
-        with st.spinner("🕉️ Designing your spiritual practice routine..."):
-            ritual_recommendations = generate_personalized_rituals(birth_data)
-        
-        if ritual_recommendations:
-            st.markdown(ritual_recommendations)
-        else:
-            st.error("❌ Unable to generate ritual recommendations. Please try again.")
+        results.append(render_recommendation(sources[2], "ritual"))
         
         st.info("🕯️ **Guidance**: Start with simple daily practices. Consistency is more important than complexity in spiritual practices.")
     
     with tab4:
         st.subheader("🙏 Charity & Service")
-        with st.spinner("🙏 Identifying your most beneficial charitable acts..."):
-            donation_recommendations = generate_personalized_donations(birth_data)
-        
-        if donation_recommendations:
-            st.markdown(donation_recommendations)
-        else:
-            st.error("❌ Unable to generate donation recommendations. Please try again.")
+        results.append(render_recommendation(sources[3], "donation"))
         
         st.success("✨ **Remember**: The intention behind charity is more important than the amount. Give with a pure heart and genuine desire to help others.")
     
+    # Only keep responses that streamed to the end without error, so failures are retried on the next run
+    if recommendations is None and outcome.get('complete') and all(results):
+        store[birth_key] = tuple(results)
+    
     render_standard_disclaimer()
 
+def _bullet_markdown(heading, items):
+    """Join a heading and its bullet items into a single markdown block"""
+    return f"**{heading}**\n\n" + "\n".join(f"- {item}" for item in items)
+
+# General remedies are static, so their markdown is built once at import time
+GENERAL_REMEDIES_MD = {
+    "mantras": _bullet_markdown("🔮 Universal Mantras for All:", [
+        "**Om Gam Ganapataye Namaha** - Removes obstacles",
+        "**Om Namah Shivaya** - Overall spiritual protection",
+        "**Gayatri Mantra** - Universal enlightenment",
+        "**Mahamrityunjaya Mantra** - Health and longevity",
+        "**Om Shri Ganeshaya Namaha** - Success in endeavors"
+    ]),
+    "gemstones": _bullet_markdown("💎 Gemstone Guidelines:", [
+        "Always consult an expert before wearing gemstones",
+        "Natural, untreated stones are most effective",
+        "Proper purification and energization is essential",
+        "Wear on the correct finger and day",
+        "Remove during illness or negative periods"
+    ]),
+    "rituals": _bullet_markdown("🕉️ Daily Spiritual Practices:", [
+        "Morning prayers and meditation",
+        "Evening gratitude practice",
+        "Regular temple visits",
+        "Reading sacred texts",
+        "Yoga and pranayama"
+    ]),
+    "donations": _bullet_markdown("🙏 Universal Charitable Acts:", [
+        "Feed the hungry and poor",
+        "Help elderly and disabled",
+        "Support education for underprivileged",
+        "Plant trees and protect environment",
+        "Donate to temples and spiritual causes"
+    ])
+}
+
 def render_general_remedies():
     """Render general remedies when no birth data is available"""
     st.subheader("🌟 General Vedic Remedies")
@@ -296,44 +261,16 @@ def render_general_remedies():
     ])
     
     with tab1:
-        st.write("**🔮 Universal Mantras for All:**")
-        st.write("""
-        - **Om Gam Ganapataye Namaha** - Removes obstacles
-        - **Om Namah Shivaya** - Overall spiritual protection
-        - **Gayatri Mantra** - Universal enlightenment
-        - **Mahamrityunjaya Mantra** - Health and longevity
-        - **Om Shri Ganeshaya Namaha** - Success in endeavors
-        """)
+        st.markdown(GENERAL_REMEDIES_MD["mantras"])
     
     with tab2:
-        st.write("**💎 Gemstone Guidelines:**")
-        st.write("""
-        - Always consult an expert before wearing gemstones
-        - Natural, untreated stones are most effective
-        - Proper purification and energization is essential
-        - Wear on the correct finger and day
-        - Remove during illness or negative periods
-        """)
+        st.markdown(GENERAL_REMEDIES_MD["gemstones"])
     
     with tab3:
-        st.write("**🕉️ Daily Spiritual Practices:**")
-        st.write("""
-        - Morning prayers and meditation
-        - Evening gratitude practice
-        - Regular temple visits
-        - Reading sacred texts
-        - Yoga and pranayama
-        """)
+        st.markdown(GENERAL_REMEDIES_MD["rituals"])
     
     with tab4:
-        st.write("**🙏 Universal Charitable Acts:**")
-        st.write("""
-        - Feed the hungry and poor
-        - Help elderly and disabled
-        - Support education for underprivileged
-        - Plant trees and protect environment
-        - Donate to temples and spiritual causes
-        """)
+        st.markdown(GENERAL_REMEDIES_MD["donations"])
 
 def main():
     page_config = {
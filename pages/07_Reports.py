@@ -1,5 +1,70 @@
 import streamlit as st
+import string
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.utils.page_utils import create_standard_page_layout
+from src.utils.common import invoke_ai_model
+
+REPORT_TYPES = [
+    "📊 Complete Birth Chart Analysis",
+    "🔮 Comprehensive Life Predictions", 
+    "💫 Dasha Period Timeline",
+    "🌟 Transit Analysis Report",
+    "💎 Personalized Remedies Guide"
+]
+
+REPORT_PROMPT_TEMPLATE = string.Template("""
+    As a Vedic astrology expert, write the "$section" section of an astrological report for someone born on:
+    
+    Date: $date
+    Time: $time
+    Place: $place
+    
+    Focus on: $focus
+    
+    Format as clear headed sections in markdown, concise and practical.
+    """)
+
+REPORT_SECTION_FOCUS = {
+    "📊 Complete Birth Chart Analysis": "ascendant, planetary placements in signs and houses, and key yogas",
+    "🔮 Comprehensive Life Predictions": "career, relationships, health and finances across life stages",
+    "💫 Dasha Period Timeline": "the Vimshottari Mahadasha sequence and what each period emphasizes",
+    "🌟 Transit Analysis Report": "current and upcoming Saturn, Jupiter and Rahu/Ketu transits",
+    "💎 Personalized Remedies Guide": "mantras, gemstones, rituals and donations suited to the chart"
+}
+
+def generate_report_section(report_type, birth_data):
+    """
+    Generate one report section with the AI model; safe to run in a worker thread.
+    Each call uses its own HTTP session, so workers share no connection state and
+    never reach the st.cache_resource session, which needs a script run context.
+    """
+    prompt = REPORT_PROMPT_TEMPLATE.substitute(
+        section=report_type.split(" ", 1)[1],
+        date=birth_data['date'],
+        time=birth_data.get('time', 'Not specified'),
+        place=birth_data.get('place', 'Not specified'),
+        focus=REPORT_SECTION_FOCUS[report_type]
+    )
+    with requests.Session() as session:
+        return invoke_ai_model(prompt, session)
+
+def render_complete_report(birth_data, report_types):
+    """Generate report sections concurrently, filling each placeholder as its section completes"""
+    placeholders = {}
+    for report_type in report_types:
+        st.subheader(report_type)
+        placeholders[report_type] = st.empty()
+        placeholders[report_type].info("⏳ Generating...")
+    
+    # Sections are independent LLM calls, so they overlap; widgets are only touched from this thread
+    with ThreadPoolExecutor(max_workers=len(report_types)) as executor:
+        futures = {
+            executor.submit(generate_report_section, report_type, birth_data): report_type
+            for report_type in report_types
+        }
+        for future in as_completed(futures):
+            placeholders[futures[future]].markdown(future.result())
 
 def render_reports_content(birth_data):
     """Render reports specific content"""
@@ -7,28 +72,27 @@ def render_reports_content(birth_data):
     
     with col1:
         st.subheader("📄 Available Reports")
-        st.info("🚧 PDF report generation coming soon!")
-        
-        report_types = [
-            "📊 Complete Birth Chart Analysis",
-            "🔮 Comprehensive Life Predictions", 
-            "💫 Dasha Period Timeline",
-            "🌟 Transit Analysis Report",
-            "💎 Personalized Remedies Guide"
-        ]
+        st.info("✨ Pick your options and click **Generate Complete Report** to write each section below.")
         
-        for report in report_types:
-            st.write(f"- {report}")
+        st.markdown("\n".join(f"- {report}" for report in REPORT_TYPES))
     
     with col2:
         st.subheader("⚙️ Report Options")
         st.selectbox("Report Language", ["English", "Hindi"], disabled=True)
         st.selectbox("Chart Style", ["North Indian", "South Indian", "Bengali"], disabled=True)
-        st.checkbox("Include Remedies", value=True, disabled=True)
-        st.checkbox("Include Transit Analysis", value=True, disabled=True)
+        include_remedies = st.checkbox("Include Remedies", value=True)
+        include_transits = st.checkbox("Include Transit Analysis", value=True)
         
-        st.button("Generate Complete Report", type="primary", disabled=True, 
-                 help="Feature coming soon!")
+        generate_clicked = st.button("Generate Complete Report", type="primary")
+    
+    if generate_clicked:
+        excluded = {
+            "💎 Personalized Remedies Guide": not include_remedies,
+            "🌟 Transit Analysis Report": not include_transits
+        }
+        report_types = [report for report in REPORT_TYPES if not excluded.get(report)]
+        st.markdown("---")
+        render_complete_report(birth_data, report_types)
     
     st.markdown("---")
     st.subheader("📋 Report Features")
@@ -1,40 +1,73 @@
+import html
 import streamlit as st
+from collections import deque
+from datetime import datetime
+from itertools import islice
 from src.utils.page_utils import (
-    render_standard_disclaimer
+    render_standard_disclaimer,
+    apply_stylesheet
+)
+from src.utils.common import (
+    stream_fun_chat_rag_response,
+    get_session_value,
+    SESSION_KEYS
 )
-from src.utils.common import generate_fun_chat_rag_response, get_session_value, SESSION_KEYS
 from src.utils.ui_components import render_sidebar_navigation
 
-def generate_fun_astro_response(user_question, birth_data=None):
-    """Generate fun and engaging astrology-themed responses with RAG enhancement"""
-    # Use the new RAG-enhanced response function
-    return generate_fun_chat_rag_response(user_question, birth_data)
+def stream_fun_astro_response(user_question, birth_data=None):
+    """Stream fun and engaging astrology-themed responses with RAG enhancement"""
+    # Use the RAG-enhanced streaming response function
+    return stream_fun_chat_rag_response(user_question, birth_data)
+
+# Icon shown next to each answer source
+METHOD_ICONS = {
+    "ChromaDB Vector Search": "🟢",
+    "Wikipedia Search": "🟠",
+    "Llama 3.2 Response": "🟣",
+    "AI Assistant": "🔵"
+}
+DEFAULT_METHOD_ICON = "⚪"
+
+# Suggested questions and the question box heading, sent to the page as one markdown element
+FUN_QUESTION_IDEAS = """
+### 💫 Fun Question Ideas:
+
+- 🧙‍♂️ What is your name?
+- 💪 How can I grow in life?
+- 🧘‍♀️ How do I take out stress from my life?
+
+---
+
+### 💫 Ask Me Anything!
+"""
+
+# Only the most recent messages are kept, so history access stays constant-size in long sessions
+FUN_CHAT_HISTORY_LIMIT = 100
 
 def get_fun_chat_history():
     """Get fun chat history from session state"""
-    messages = st.session_state.get('fun_chat_messages', [])
-    # Clean up any invalid messages from old format
-    valid_messages = [msg for msg in messages if isinstance(msg, dict) and 'question' in msg and 'answer' in msg]
-    
-    # If we had to filter out invalid messages, update the session state
-    if len(valid_messages) != len(messages):
-        st.session_state.fun_chat_messages = valid_messages
-    
-    return valid_messages
+    messages = st.session_state.get('fun_chat_messages')
+    if messages is None:
+        messages = st.session_state.fun_chat_messages = deque(maxlen=FUN_CHAT_HISTORY_LIMIT)
+    elif not isinstance(messages, deque):
+        # One-time upgrade of a list from an older session, dropping messages in the old format
+        messages = st.session_state.fun_chat_messages = deque(
+            (msg for msg in messages if isinstance(msg, dict) and 'question' in msg and 'answer' in msg),
+            maxlen=FUN_CHAT_HISTORY_LIMIT
+        )
+    return messages
 
 def add_to_fun_chat_history(question, answer):
     """Add message to fun chat history"""
-    if 'fun_chat_messages' not in st.session_state:
-        st.session_state.fun_chat_messages = []
-    
-    from datetime import datetime
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
     
     # Get method info if available
     method_info = st.session_state.get('last_rag_method', {})
     
     message_data = {
         'question': question,
+        # Label text for the history list, truncated once here rather than on every render
+        'question_preview': question[:50] + ('...' if len(question) > 50 else ''),
         'answer': answer,
         'timestamp': timestamp
     }
@@ -44,173 +77,122 @@ def add_to_fun_chat_history(question, answer):
         message_data['method'] = method_info.get('method', 'unknown')
         message_data['similarity'] = method_info.get('similarity', 0.0)
     
-    st.session_state.fun_chat_messages.append(message_data)
+    # Messages are only ever built here, so they are valid on insertion and never re-checked
+    get_fun_chat_history().append(message_data)
 
 def clear_fun_chat_history():
     """Clear fun chat history"""
-    st.session_state.fun_chat_messages = []
+    st.session_state.fun_chat_messages = deque(maxlen=FUN_CHAT_HISTORY_LIMIT)
+    st.session_state.pop('fun_chat_history_html', None)
+
+def build_fun_chat_history_html(messages):
+    """Collapsible history entries, latest first, as one HTML/markdown string"""
+    entries = []
+    for number in range(len(messages), 0, -1):
+        msg = messages[number - 1]
+        question = html.escape(msg['question'], quote=False)
+        
+        # Get method info for display
+        method = msg.get('method', 'Unknown')
+        similarity = msg.get('similarity', 0.0)
+        method_icon = METHOD_ICONS.get(method, DEFAULT_METHOD_ICON)
+        
+        # Create summary title with method info
+        preview = html.escape(msg.get('question_preview') or msg['question'][:50])
+        summary = f"Q{number}: {preview} {method_icon}" if method != 'Unknown' else f"Q{number}: {preview}"
+        
+        # Blank lines around the body let the answer's markdown render inside <details>
+        lines = [
+            f"<details><summary>{summary}</summary>",
+            "",
+            f"**🙋 You:** {question}",
+            "",
+            f"**🎉 Maha Prabhu:** {html.escape(msg['answer'], quote=False)}",
+            ""
+        ]
+        
+        # Show method and similarity if available
+        if method != 'Unknown':
+            lines += [f"<small><b>Source:</b> {method_icon} {html.escape(method)} (Similarity: {similarity:.1%})</small>", ""]
+        
+        if msg.get('timestamp'):
+            lines += [f"<small><i>Asked: {msg['timestamp']}</i></small>", ""]
+        
+        lines.append("</details>")
+        entries.append("\n".join(lines))
+    return "\n\n".join(entries)
+
+def get_fun_chat_history_html(messages):
+    """History HTML, rebuilt only when a message was added or the history was cleared"""
+    # Messages are never edited in place, so the count plus the newest message identify the history
+    version = (len(messages), id(messages[-1]) if messages else None)
+    cached = st.session_state.get('fun_chat_history_html')
+    if not cached or cached[0] != version:
+        cached = st.session_state.fun_chat_history_html = (version, build_fun_chat_history_html(messages))
+    return cached[1]
 
 def render_fun_chat(birth_data):
     """Render interactive fun chat interface similar to Astro Chat"""
-    # Initialize session state for input clearing
-    if 'fun_input_counter' not in st.session_state:
-        st.session_state.fun_input_counter = 0
-    
     # Add custom CSS for fun chat styling
-    st.markdown("""
-    <style>
-    /* Fun chat styling */
-    .stTabs [data-baseweb="tab-panel"] > div {
-        padding-top: 0.25rem !important;
-    }
-    
-    /* Compact the expanders */
-    .stExpander summary {
-        padding: 0.375rem 0.75rem !important;
-    }
-    
-    /* Reduce spacing in content */
-    .stVerticalBlock {
-        gap: 0.5rem !important;
-    }
-    
-    /* Make buttons more compact */
-    button[data-testid="stBaseButton-secondary"] {
-        padding: 0.25rem 0.5rem !important;
-        font-size: 0.875rem !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    apply_stylesheet("fun_chat.css")
     
     # Display chat history
-    chat_messages = get_fun_chat_history()
-    
-    # Filter out messages that don't have the expected structure
-    valid_messages = [msg for msg in chat_messages if isinstance(msg, dict) and 'question' in msg and 'answer' in msg]
+    messages = get_fun_chat_history()
     
-    if valid_messages:
+    if messages:
         st.write("### 🌟 Fun Conversation History")
         
-        # Display messages in reverse order (latest first)
-        for i, msg in enumerate(reversed(valid_messages), 1):
-            # Get method info for display
-            method = msg.get('method', 'Unknown')
-            similarity = msg.get('similarity', 0.0)
-            
-            # Choose color based on method
-            if method == "ChromaDB Vector Search":
-                method_icon = "🟢"
-            elif method == "Wikipedia Search":
-                method_icon = "🟠"
-            elif method == "Llama 3.2 Response":
-                method_icon = "🟣"
-            elif method == "AI Assistant":
-                method_icon = "🔵"
-            else:
-                method_icon = "⚪"
-            
-            # Create expander title with method info
-            if method != 'Unknown':
-                expander_title = f"Q{len(valid_messages) - i + 1}: {msg['question'][:40]}... {method_icon}"
-            else:
-                expander_title = f"Q{len(valid_messages) - i + 1}: {msg['question'][:50]}..."
-            
-            with st.expander(expander_title, expanded=False):
-                st.write(f"**🙋 You:** {msg['question']}")
-                st.write(f"**🎉 Maha Prabhu:** {msg['answer']}")
-                
-                # Show method and similarity if available
-                if method != 'Unknown':
-                    st.caption(f"**Source:** {method_icon} {method} (Similarity: {similarity:.1%})")
-                
-                if msg.get('timestamp'):
-                    st.caption(f"*Asked: {msg['timestamp']}*")
+        # Display messages in reverse order (latest first), as a single markdown element
+        st.markdown(get_fun_chat_history_html(messages), unsafe_allow_html=True)
         
         st.markdown("---")
     else:
         # Welcome message for new users
         st.info("🌟 Welcome to Fun Astro Chat! I'm Maha Prabhu, your mystical guide ready to make astrology fun and engaging! Ask me anything or just chat! ✨")
     
-    # Fun suggestion list (non-clickable) - moved above question input
-    # st.markdown("---")
-    st.write("### 💫 Fun Question Ideas:")
-    
-    st.markdown("""
-    - 🧙‍♂️ What is your name?
-    - 💪 How can I grow in life?
-    - 🧘‍♀️ How do I take out stress from my life?
-    """)
-    
-    
-    st.markdown("---")
-    # Question input
-    st.write("### 💫 Ask Me Anything!")
+    # Fun suggestion list (non-clickable) and question input heading
+    st.markdown(FUN_QUESTION_IDEAS)
     
-    # Question input field with dynamic key for clearing
-    user_question = st.text_input(
-        "What's on your cosmic mind?", 
-        value=st.session_state.get('fun_suggested_question', ''),
-        placeholder="e.g., What's my cosmic vibe today? Tell me a fun astro fact!",
-        key=f"fun_user_question_input_{st.session_state.fun_input_counter}"
-    )
-    
-    # Clear suggested question after use
-    if 'fun_suggested_question' in st.session_state:
-        del st.session_state.fun_suggested_question
-    
-    # Submit and clear buttons
-    col_submit, col_clear = st.columns([3, 1])
-    with col_submit:
-        if st.button("🌟 Chat with Maha Prabhu!", type="primary", disabled=not user_question.strip()):
-            if user_question.strip():
-                with st.spinner("🌟 Consulting the cosmic wisdom..."):
-                    # Get fun AI response
-                    response = generate_fun_astro_response(user_question, birth_data)
-                    
-                    if response:
-                        # Add to chat history
-                        add_to_fun_chat_history(user_question, response)
-                        
-                        # Show the response
-                        st.success("✨ Cosmic wisdom received!")
-                        
-                        # Display method used (if available)
-                        if 'last_rag_method' in st.session_state and st.session_state.last_rag_method:
-                            method_info = st.session_state.last_rag_method
-                            method = method_info.get('method', 'unknown')
-                            similarity = method_info.get('similarity', 0.0)
-                            
-                            # Color code based on method
-                            if method == "ChromaDB Vector Search":
-                                method_color = "🟢"
-                            elif method == "Wikipedia Search":
-                                method_color = "🟠"
-                            elif method == "Llama 3.2 Response":
-                                method_color = "🟣"
-                            elif method == "AI Assistant":
-                                method_color = "🔵"
-                            else:
-                                method_color = "⚪"
-                            
-                            st.info(f"{method_color} **Answer Source:** {method} (Similarity: {similarity:.1%})")
-                        
-                        with st.container():
-                            st.write(f"**🙋 Your Question:** {user_question}")
-                            st.write(f"**🎉 Maha Prabhu's Answer:**")
-                            st.markdown(response)
-                        
-                        # Clear the input by incrementing counter
-                        st.session_state.fun_input_counter += 1
-                        
-                        # Rerun to update chat history display
-                        st.rerun()
-                    else:
-                        st.error("🌙 Oops! The cosmic signals seem a bit fuzzy right now. Try asking again! ✨")
+    # Question input and submit share a form, so typing does not rerun the page;
+    # the field clears itself once the question is sent
+    with st.form("fun_chat_form", clear_on_submit=True):
+        user_question = st.text_input(
+            "What's on your cosmic mind?", 
+            placeholder="e.g., What's my cosmic vibe today? Tell me a fun astro fact!"
+        )
+        submitted = st.form_submit_button("🌟 Chat with Maha Prabhu!", type="primary")
     
-    with col_clear:
-        if st.button("🔄 Clear Chat"):
-            clear_fun_chat_history()
+    if submitted and user_question.strip():
+        with st.container():
+            st.write(f"**🙋 Your Question:** {user_question}")
+            st.write(f"**🎉 Maha Prabhu's Answer:**")
+            # Paint the answer as it arrives instead of waiting for the full response
+            response = st.write_stream(stream_fun_astro_response(user_question, birth_data))
+        
+        if response:
+            # Add to chat history
+            add_to_fun_chat_history(user_question, response)
+            
+            # Show the response
+            st.success("✨ Cosmic wisdom received!")
+            
+            # Display method used (if available)
+            if 'last_rag_method' in st.session_state and st.session_state.last_rag_method:
+                method_info = st.session_state.last_rag_method
+                method = method_info.get('method', 'unknown')
+                similarity = method_info.get('similarity', 0.0)
+                
+                method_icon = METHOD_ICONS.get(method, DEFAULT_METHOD_ICON)
+                st.info(f"{method_icon} **Answer Source:** {method} (Similarity: {similarity:.1%})")
+            
+            # Rerun to update chat history display
             st.rerun()
+        else:
+            st.error("🌙 Oops! The cosmic signals seem a bit fuzzy right now. Try asking again! ✨")
+    
+    if st.button("🔄 Clear Chat"):
+        clear_fun_chat_history()
+        st.rerun()
 
 def render_fun_chat_sidebar_info():
     """Render fun chat information in sidebar"""
@@ -223,11 +205,11 @@ def render_fun_chat_sidebar_info():
         system_details = "Using enhanced AI responses"
         
         try:
-            from src.utils.multi_method_rag import get_multi_method_rag
+            from src.utils.multi_method_rag import get_multi_method_rag, get_cached_knowledge_base_size
             multi_rag = get_multi_method_rag()
             if multi_rag.is_available():
                 system_status = "🚀 Multi-Method RAG System"
-                kb_size = multi_rag.get_knowledge_base_size()
+                kb_size = get_cached_knowledge_base_size()
                 system_details = f"ChromaDB Vector Search ({kb_size} documents)"
                 st.success(f"{system_status}: Active")
                 st.caption(system_details)
@@ -253,28 +235,17 @@ def render_fun_chat_sidebar_info():
             similarity = method_info.get('similarity', 0.0)
             
             st.write("**Last Answer Source:**")
-            if method == "ChromaDB Vector Search":
-                st.success(f"🟢 {method}")
-            elif method == "Wikipedia Search":
-                st.info(f"🟠 {method}")
-            elif method == "Llama 3.2 Response":
-                st.info(f"🔵 {method}")
-            elif method == "AI Assistant":
-                st.info(f"🔵 {method}")
-            else:
-                st.info(f"⚪ {method}")
+            show_source = st.success if method == "ChromaDB Vector Search" else st.info
+            show_source(f"{METHOD_ICONS.get(method, DEFAULT_METHOD_ICON)} {method}")
             
             st.caption(f"Similarity: {similarity:.1%}")
         
-        chat_messages = get_fun_chat_history()
-        
-        # Filter out messages that don't have the expected structure
-        valid_messages = [msg for msg in chat_messages if isinstance(msg, dict) and 'question' in msg]
+        messages = get_fun_chat_history()
         
-        if valid_messages:
-            st.write(f"**Fun Questions Asked:** {len(valid_messages)}")
+        if messages:
+            st.write(f"**Fun Questions Asked:** {len(messages)}")
             st.write("**Recent Fun Topics:**")
-            for msg in valid_messages[-3:]:  # Show last 3 questions
+            for msg in reversed(list(islice(reversed(messages), 3))):  # Show last 3 questions
                 st.caption(f"🌟 {msg['question'][:25]}...")
         else:
             st.write("No fun questions yet!")
@@ -308,10 +279,10 @@ def main():
     
     try:
         # Check for Multi-Method RAG
-        from src.utils.multi_method_rag import get_multi_method_rag
+        from src.utils.multi_method_rag import get_multi_method_rag, get_cached_knowledge_base_size
         multi_rag = get_multi_method_rag()
         if multi_rag.is_available():
-            kb_size = multi_rag.get_knowledge_base_size()
+            kb_size = get_cached_knowledge_base_size()
             system_info = f"🚀 **Multi-Method ChromaDB RAG:** I use 4 search methods with {multi_rag.similarity_threshold:.0%} similarity threshold!"
             st.info(system_info)
             
@@ -18,14 +18,9 @@ def clear_embeddings():
     
     if embeddings_dir.exists():
         try:
-            # Remove all files and directories in embeddings folder
-            for item in embeddings_dir.iterdir():
-                if item.is_file():
-                    item.unlink()
-                    print(f"   Deleted file: {item.name}")
-                elif item.is_dir():
-                    shutil.rmtree(item)
-                    print(f"   Deleted directory: {item.name}")
+            # Remove the whole embeddings folder in one call and recreate it empty
+            shutil.rmtree(embeddings_dir)
+            embeddings_dir.mkdir(parents=True, exist_ok=True)
             
             print("✅ Successfully cleared old embeddings")
             return True
@@ -49,21 +44,25 @@ def check_rag_file():
     
     # Show content preview
     try:
+        # Count questions line by line, keeping only the first few for the preview
+        question_count = 0
+        preview = []
         with open(rag_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.strip().split('\n')
-            
-        # Count questions
-        questions = [line for line in lines if line.strip().startswith('Question:')]
-        print(f"📊 RAG.txt contains {len(questions)} questions")
+            for line in f:
+                if line.lstrip().startswith('Question:'):
+                    question_count += 1
+                    if len(preview) < 3:
+                        preview.append(line.strip())
+        
+        print(f"📊 RAG.txt contains {question_count} questions")
         
         # Show first few questions as preview
         print("\n📝 Preview of questions in RAG.txt:")
-        for i, q in enumerate(questions[:3]):
-            print(f"   {i+1}. {q.strip()}")
+        for i, q in enumerate(preview):
+            print(f"   {i+1}. {q}")
         
-        if len(questions) > 3:
-            print(f"   ... and {len(questions) - 3} more questions")
+        if question_count > 3:
+            print(f"   ... and {question_count - 3} more questions")
             
         return True
         
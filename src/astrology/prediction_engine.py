@@ -1,50 +1,23 @@
 import streamlit as st
-from langchain.memory import ConversationBufferWindowMemory
-from langchain.schema import HumanMessage, AIMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.chains import ConversationChain
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder, PromptTemplate
 from src.utils.common import (
     setup_ai_model,
-    generate_ai_response,
+    invoke_ollama,
+    stream_ai_model,
+    split_stream_sections,
     format_birth_datetime
 )
 
-def generate_quick_prediction(birth_date, birth_time, birth_place):
-    """Generate quick astrological prediction using AI"""
-    # Format birth data for prompt
-    formatted_data = format_birth_datetime(birth_date, birth_time)
-    
-    prompt = f"""
-    As a professional Vedic astrologer, provide a brief astrological insight for someone born on:
-    
-    Date: {formatted_data['date_str']}
-    Time: {formatted_data['time_str']}
-    Place: {birth_place}
-    
-    Please provide:
+# Instruction blocks shared by the single and combined prediction prompts
+QUICK_PREDICTION_INSTRUCTIONS = """    Please provide:
     1. A brief personality insight based on potential planetary positions
     2. One key strength and one area for growth
     3. A positive affirmation for today
     
     Keep the response concise (under 200 words) and encouraging. Focus on general Vedic astrology principles.
-    """
-    
-    # Remove spinner from here as it's handled at the UI level
-    return generate_ai_response(prompt)
+"""
 
-def generate_detailed_prediction(birth_data):
-    """Generate detailed astrological prediction for comprehensive analysis"""
-    # Format birth data for prompt
-    formatted_data = format_birth_datetime(birth_data['date'], birth_data['time'])
-    
-    prompt = f"""
-    As a master Vedic astrologer, provide a comprehensive astrological analysis for:
-    
-    Birth Date: {formatted_data['date_str']}
-    Birth Time: {formatted_data['time_str']}
-    Birth Place: {birth_data['place']}
-    
-    Please provide detailed insights on:
+DETAILED_PREDICTION_INSTRUCTIONS = """    Please provide detailed insights on:
     1. **Personality and Character Traits**
     2. **Career and Professional Life**
     3. **Relationships and Marriage**
@@ -54,106 +27,211 @@ def generate_detailed_prediction(birth_data):
     
     Base your analysis on traditional Vedic astrology principles and provide practical guidance.
     Format your response with clear sections and bullet points for easy reading.
+"""
+
+DETAILED_SECTION_MARKER = "=== DETAILED ==="
+
+# Prompt templates are parsed once at import; calls only fill in the birth details
+DETAILED_PREDICTION_PROMPT = PromptTemplate.from_template("""
+    As a master Vedic astrologer, provide a comprehensive astrological analysis for:
+    
+    Birth Date: {date_str}
+    Birth Time: {time_str}
+    Birth Place: {place}
     
+""" + DETAILED_PREDICTION_INSTRUCTIONS + """    
     After this analysis, I will be available to answer any specific questions about this person's astrological chart.
-    """
+    """)
+
+COMBINED_PREDICTION_PROMPT = PromptTemplate.from_template("""
+    As a master Vedic astrologer, write two readings for someone born on:
+    
+    Date: {date_str}
+    Time: {time_str}
+    Place: {place}
+    
+    Start with a brief insight.
+""" + QUICK_PREDICTION_INSTRUCTIONS + """    
+    Then write a line containing only """ + DETAILED_SECTION_MARKER + """, followed by a comprehensive analysis.
+""" + DETAILED_PREDICTION_INSTRUCTIONS + "    ")
+
+ASTROLOGY_CHAT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a master Vedic astrologer providing personalized insights for:
+
+Birth Date: {date_str}
+Birth Time: {time_str}
+Birth Place: {place}
+
+Guidelines for your responses:
+1. Always reference the specific birth details when relevant
+2. Use traditional Vedic astrology principles
+3. Provide practical, actionable guidance
+4. Keep responses focused and informative
+5. If asked non-astrological questions, gently redirect to astrology topics
+6. Remember our conversation history to provide contextual responses
+7. Use clear formatting with bullet points when appropriate
+
+Maintain the context of this birth chart throughout our conversation."""),
+    MessagesPlaceholder(variable_name="history"),
+    ("human", "{input}")
+])
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=512)
+def _cached_ai_response(prompt):
+    """AI response for a prediction prompt, reused for an hour; failures raise, so they are never cached"""
+    return invoke_ollama(prompt)
+
+def generate_cached_ai_response(prompt, spinner_text="🔮 Generating response..."):
+    """Generate a prediction response, reusing the result when the same prompt was seen recently"""
+    with st.spinner(spinner_text):
+        try:
+            return _cached_ai_response(prompt)
+        except Exception as e:
+            return f"Unable to generate response at this time. Error: {str(e)}"
+
+def generate_detailed_prediction(birth_data):
+    """Generate detailed astrological prediction for comprehensive analysis"""
+    # Format birth data for prompt
+    formatted_data = format_birth_datetime(birth_data['date'], birth_data['time'])
+    prompt = DETAILED_PREDICTION_PROMPT.format(
+        date_str=formatted_data['date_str'],
+        time_str=formatted_data['time_str'],
+        place=birth_data['place']
+    )
     
     # Remove spinner from here as it's handled at the UI level
-    return generate_ai_response(prompt)
+    return generate_cached_ai_response(prompt)
+
+def stream_combined_prediction(birth_data):
+    """
+    Stream the quick and detailed predictions from a single AI call
+    Returns (quick chunks, detailed chunks), to be consumed in that order; the quick part
+    can be shown while the detailed part is still being written. Model failures raise.
+    """
+    formatted_data = format_birth_datetime(birth_data['date'], birth_data['time'])
+    prompt = COMBINED_PREDICTION_PROMPT.format(
+        date_str=formatted_data['date_str'],
+        time_str=formatted_data['time_str'],
+        place=birth_data['place']
+    )
+    
+    return split_stream_sections(stream_ai_model(prompt), 2, DETAILED_SECTION_MARKER)
+
+def birth_details_key(birth_data):
+    """Birth details identifying a chart, for matching stored predictions and chat sessions"""
+    return (birth_data.get('date'), birth_data.get('time'), birth_data.get('place'))
 
 def initialize_chat_memory(birth_data):
-    """Initialize conversation memory with birth chart context"""
-    if 'chat_memory' not in st.session_state:
+    """Create conversation memory with birth chart context"""
+    # Imported on first chat use; the langchain package is slow to import and most pages never need it
+    from langchain.memory import ConversationBufferWindowMemory, ConversationSummaryBufferMemory
+    
+    llm = setup_ai_model()
+    if llm:
+        # Older exchanges are folded into a running summary, so each turn re-sends
+        # at most ~1500 tokens of history instead of ten full exchanges
+        memory = ConversationSummaryBufferMemory(
+            llm=llm,
+            max_token_limit=1500,
+            return_messages=True,
+            memory_key="history"
+        )
+    else:
         # Create memory that remembers last 10 exchanges
-        st.session_state.chat_memory = ConversationBufferWindowMemory(
+        memory = ConversationBufferWindowMemory(
             k=10,  # Remember last 10 exchanges
             return_messages=True,
             memory_key="history"
         )
-        
-        # Initialize with birth data context
-        formatted_data = format_birth_datetime(birth_data['date'], birth_data['time'])
-        context_message = f"""I am analyzing the astrological chart for someone born on:
-        
-Date: {formatted_data['date_str']}
-Time: {formatted_data['time_str']}
-Place: {birth_data['place']}
-
-I will provide detailed Vedic astrological insights and answer questions about this birth chart."""
-        
-        # Add initial context to memory
-        st.session_state.chat_memory.chat_memory.add_ai_message(context_message)
     
-    return st.session_state.chat_memory
+    # Short context note; the full birth details are already in the system prompt
+    context_message = f"I am analyzing the birth chart of someone born in {birth_data['place']} and will answer questions about it."
+    
+    # Add initial context to memory
+    memory.chat_memory.add_ai_message(context_message)
+    
+    return memory
 
 def create_astrology_chat_chain(birth_data):
-    """Create a conversation chain for astrology chat"""
-    # Initialize memory
-    memory = initialize_chat_memory(birth_data)
-    
+    """Create the astrology chat chain (prompt | llm) and its memory for one birth chart"""
     # Get the LLM
     llm = setup_ai_model()
     if not llm:
         return None
     
-    # Create the prompt template with history awareness
+    # Bind this chart's birth details to the shared prompt template
     formatted_data = format_birth_datetime(birth_data['date'], birth_data['time'])
+    prompt_template = ASTROLOGY_CHAT_PROMPT.partial(
+        date_str=formatted_data['date_str'],
+        time_str=formatted_data['time_str'],
+        place=birth_data['place']
+    )
     
-    prompt_template = ChatPromptTemplate.from_messages([
-        ("system", f"""You are a master Vedic astrologer providing personalized insights for:
+    return {
+        'chain': prompt_template | llm,
+        'memory': initialize_chat_memory(birth_data)
+    }
 
-Birth Date: {formatted_data['date_str']}
-Birth Time: {formatted_data['time_str']}
-Birth Place: {birth_data['place']}
+def get_astrology_chat_chain(birth_data):
+    """Chat chain and memory for this birth chart, built once per chart in the session"""
+    chains = st.session_state.setdefault('astro_chat_chains', {})
+    key = birth_details_key(birth_data)
+    if key not in chains:
+        chat = create_astrology_chat_chain(birth_data)
+        if not chat:
+            return None
+        chains[key] = chat
+    return chains[key]
 
-Guidelines for your responses:
-1. Always reference the specific birth details when relevant
-2. Use traditional Vedic astrology principles
-3. Provide practical, actionable guidance
-4. Keep responses focused and informative
-5. If asked non-astrological questions, gently redirect to astrology topics
-6. Remember our conversation history to provide contextual responses
-7. Use clear formatting with bullet points when appropriate
-
-Maintain the context of this birth chart throughout our conversation."""),
-        MessagesPlaceholder(variable_name="history"),
-        ("human", "{input}")
-    ])
-    
-    # Create the conversation chain
-    chain = ConversationChain(
-        llm=llm,
-        prompt=prompt_template,
-        memory=memory,
-        verbose=False
-    )
-    
-    return chain
+def _chat_inputs(memory, user_question):
+    """Prompt variables for one chat turn: the question plus the remembered history"""
+    return {
+        'input': user_question,
+        'history': memory.load_memory_variables({})[memory.memory_key]
+    }
 
 def get_chat_response(birth_data, user_question):
     """Get response from the astrology chat chain"""
     try:
-        # Create or get existing chain
-        if 'astro_chat_chain' not in st.session_state:
-            st.session_state.astro_chat_chain = create_astrology_chat_chain(birth_data)
-        
-        chain = st.session_state.astro_chat_chain
-        if not chain:
+        chat = get_astrology_chat_chain(birth_data)
+        if not chat:
             return "Unable to initialize chat system. Please try again."
         
         # Get response
-        response = chain.predict(input=user_question)
+        memory = chat['memory']
+        response = chat['chain'].invoke(_chat_inputs(memory, user_question))
+        response = response if isinstance(response, str) else str(response)
+        
+        memory.save_context({'input': user_question}, {'response': response})
         return response
         
     except Exception as e:
         return f"Unable to process your question at this time. Error: {str(e)}"
 
+def stream_chat_response(birth_data, user_question):
+    """Yield the astrology chat answer as the model writes it, then record the turn in chat memory"""
+    try:
+        chat = get_astrology_chat_chain(birth_data)
+        if not chat:
+            yield "Unable to initialize chat system. Please try again."
+            return
+        
+        memory = chat['memory']
+        chunks = []
+        for chunk in chat['chain'].stream(_chat_inputs(memory, user_question)):
+            chunk = chunk if isinstance(chunk, str) else str(chunk)
+            chunks.append(chunk)
+            yield chunk
+        
+        memory.save_context({'input': user_question}, {'response': "".join(chunks)})
+        
+    except Exception as e:
+        yield f"Unable to process your question at this time. Error: {str(e)}"
+
 def clear_chat_history():
     """Clear chat history and memory"""
-    if 'chat_memory' in st.session_state:
-        del st.session_state.chat_memory
-    if 'astro_chat_chain' in st.session_state:
-        del st.session_state.astro_chat_chain
+    if 'astro_chat_chains' in st.session_state:
+        del st.session_state.astro_chat_chains
     if 'chat_messages' in st.session_state:
         del st.session_state.chat_messages
 
@@ -1,8 +1,45 @@
 # Dasha period calculations
+import logging
+import math
+import numpy as np
 import streamlit as st
+from bisect import bisect_left
+from collections import namedtuple
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate
 import swisseph as swe
 
+# Ephemeris path is process-wide Swiss Ephemeris state, so it is set once at import
+swe.set_ephe_path('')
+
+logger = logging.getLogger(__name__)
+
+# One row of the life timeline; elapsed_years and remaining_years are None except for the current period
+DashaPeriod = namedtuple(
+    'DashaPeriod',
+    'planet start_date end_date is_current is_past period_years elapsed_years remaining_years'
+)
+
+# Dasha years are Julian years
+DAYS_PER_YEAR = 365.25
+
+@lru_cache(maxsize=4096)
+def _moon_longitude(jd: float) -> float:
+    """Moon longitude from Swiss Ephemeris, memoized per Julian day
+    
+    The current dasha and the life timeline both start from the birth Moon, so one
+    page render asks for the same instant twice. Callers round jd to keep keys stable.
+    """
+    return swe.calc_ut(jd, swe.MOON)[0][0]
+
+# A Julian year is a whole number of microseconds, so whole-year offsets convert exactly
+MICROSECONDS_PER_YEAR = 31_557_600_000_000  # 365.25 * 86400 * 10**6
+
+def _years_to_timedelta64(years):
+    """Convert an int64 array of whole dasha years to microsecond timedelta64 values"""
+    return (years * MICROSECONDS_PER_YEAR).astype('timedelta64[us]')
+
 class VimshottariDashaCalculator:
     """Vimshottari Dasha System Calculator"""
     
@@ -19,15 +56,23 @@ class VimshottariDashaCalculator:
         'Venus': 20
     }
     
-    # Nakshatra to ruling planet mapping
-    NAKSHATRA_LORDS = [
-        'Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury',  # 1-9
-        'Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury',  # 10-18
-        'Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury'   # 19-27
-    ]
+    # Dasha order and period lengths as flat tables, built once at class load
+    PLANET_SEQUENCE = tuple(DASHA_PERIODS)
+    PLANET_INDEX = {planet: index for index, planet in enumerate(PLANET_SEQUENCE)}
+    PERIOD_YEARS = tuple(DASHA_PERIODS.values())
+    PERIOD_TIMEDELTAS = tuple(timedelta(days=years * DAYS_PER_YEAR) for years in PERIOD_YEARS)
+    TOTAL_CYCLE_YEARS = sum(PERIOD_YEARS)  # 120 years
     
-    def __init__(self):
-        swe.set_ephe_path('')
+    # Years elapsed at the end of each period, over two cycles so any start planet can
+    # look up a full cycle ahead without wrapping
+    CUMULATIVE_YEARS = tuple(accumulate(PERIOD_YEARS * 2))
+    
+    # Exact nakshatra span (13°20') and its reciprocal, instead of a truncated 13.333333333
+    NAKSHATRA_SPAN_DEGREES = 360.0 / 27.0
+    NAKSHATRAS_PER_DEGREE = 27.0 / 360.0
+    
+    # Nakshatra lords repeat every 9 nakshatras (1, 10, 19 are Ketu, and so on)
+    NAKSHATRA_LORDS = ('Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury')
     
     def calculate_moon_nakshatra(self, birth_date, birth_time):
         """Calculate Moon's nakshatra at birth"""
@@ -40,23 +85,24 @@ class VimshottariDashaCalculator:
                 birth_time.hour + birth_time.minute/60.0
             )
             
-            # Calculate Moon position
-            result = swe.calc_ut(jd, swe.MOON)
-            moon_longitude = result[0][0]
+            # Calculate Moon position (0.000001 day is under a tenth of a second)
+            moon_longitude = _moon_longitude(round(jd, 6))
             
-            # Calculate nakshatra (each nakshatra is 13°20' = 13.333...)
-            nakshatra_number = int(moon_longitude / 13.333333333) + 1
-            nakshatra_degree = moon_longitude % 13.333333333
+            # Calculate nakshatra (each nakshatra is 13°20'); min() guards a longitude rounding up to 360°
+            nakshatra_index = min(int(moon_longitude * self.NAKSHATRAS_PER_DEGREE), 26)
+            nakshatra_number = nakshatra_index + 1
+            nakshatra_degree = moon_longitude - nakshatra_index * self.NAKSHATRA_SPAN_DEGREES
             
             return {
                 'nakshatra_number': nakshatra_number,
                 'nakshatra_degree': nakshatra_degree,
                 'moon_longitude': moon_longitude,
-                'nakshatra_lord': self.NAKSHATRA_LORDS[nakshatra_number - 1]
+                'nakshatra_lord': self.NAKSHATRA_LORDS[nakshatra_index % len(self.NAKSHATRA_LORDS)]
             }
             
-        except Exception as e:
-            st.error(f"Error calculating nakshatra: {e}")
+        except Exception:
+            # The Dasha page reports a None result to the user; the details go to the log
+            logger.exception("Error calculating nakshatra")
             return None
     
     def calculate_dasha_start_date(self, birth_date, birth_time):
@@ -66,7 +112,7 @@ class VimshottariDashaCalculator:
             return None
         
         # Calculate how much of the nakshatra is completed
-        nakshatra_completed = nakshatra_data['nakshatra_degree'] / 13.333333333
+        nakshatra_completed = nakshatra_data['nakshatra_degree'] * self.NAKSHATRAS_PER_DEGREE
         
         # Get the ruling planet and its period
         ruling_planet = nakshatra_data['nakshatra_lord']
@@ -78,11 +124,13 @@ class VimshottariDashaCalculator:
         # Calculate when this dasha started (before birth)
         completed_years = total_period_years - remaining_years
         birth_datetime = datetime.combine(birth_date, birth_time)
-        dasha_start_date = birth_datetime - timedelta(days=completed_years * 365.25)
+        dasha_start_date = birth_datetime - timedelta(days=completed_years * DAYS_PER_YEAR)
         
         return {
             'ruling_planet': ruling_planet,
+            'birth_datetime': birth_datetime,
             'dasha_start_date': dasha_start_date,
+            'dasha_end_date': birth_datetime + timedelta(days=remaining_years * DAYS_PER_YEAR),
             'total_period_years': total_period_years,
             'completed_at_birth_years': completed_years,
             'remaining_at_birth_years': remaining_years,
@@ -96,11 +144,11 @@ class VimshottariDashaCalculator:
             return None
         
         current_date = datetime.now()
-        birth_datetime = datetime.combine(birth_date, birth_time)
+        birth_datetime = dasha_info['birth_datetime']
         
         # Calculate time elapsed since birth
         elapsed_time = current_date - birth_datetime
-        elapsed_years = elapsed_time.days / 365.25
+        elapsed_years = elapsed_time.days / DAYS_PER_YEAR
         
         # Start with the birth dasha information
         current_planet = dasha_info['ruling_planet']
@@ -116,38 +164,52 @@ class VimshottariDashaCalculator:
                 'total_period_years': self.DASHA_PERIODS[current_planet],
                 'elapsed_years': self.DASHA_PERIODS[current_planet] - remaining_years,
                 'remaining_years': remaining_years,
-                'end_date': birth_datetime + timedelta(days=remaining_at_birth * 365.25)
+                'end_date': dasha_info['dasha_end_date']
             }
         
         # Move through subsequent dashas
         years_to_account = elapsed_years - remaining_at_birth
-        current_start = birth_datetime + timedelta(days=remaining_at_birth * 365.25)
+        current_start = dasha_info['dasha_end_date']
         
-        # Get dasha sequence starting from next planet
-        planet_sequence = list(self.DASHA_PERIODS.keys())
-        start_index = (planet_sequence.index(current_planet) + 1) % len(planet_sequence)
+        # Whole 120-year cycles are skipped; what is left falls within one cycle,
+        # ending exactly on a period boundary rather than spilling into the next cycle
+        completed_cycles = math.ceil(years_to_account / self.TOTAL_CYCLE_YEARS) - 1
+        years_in_cycle = years_to_account - completed_cycles * self.TOTAL_CYCLE_YEARS
         
-        while years_to_account > 0:
-            current_planet = planet_sequence[start_index]
-            period_years = self.DASHA_PERIODS[current_planet]
-            
-            if years_to_account <= period_years:
-                # Current dasha found
-                remaining_years = period_years - years_to_account
+        # Binary search for the period containing that point, starting from the planet
+        # after the birth dasha; a period that ends exactly at that point is the current one
+        start_index = self.PLANET_INDEX[current_planet] + 1
+        years_before_start = self.CUMULATIVE_YEARS[start_index - 1]
+        index = bisect_left(self.CUMULATIVE_YEARS, years_before_start + years_in_cycle, start_index)
+        
+        planet_index = index % len(self.PLANET_SEQUENCE)
+        current_planet = self.PLANET_SEQUENCE[planet_index]
+        period_years = self.PERIOD_YEARS[planet_index]
+        period_start_years = self.CUMULATIVE_YEARS[index] - period_years - years_before_start
+        
+        elapsed_in_period = years_in_cycle - period_start_years
+        current_start += timedelta(days=(completed_cycles * self.TOTAL_CYCLE_YEARS + period_start_years) * DAYS_PER_YEAR)
+        return {
+            'current_planet': current_planet,
+            'dasha_start_date': current_start,
+            'total_period_years': period_years,
+            'elapsed_years': elapsed_in_period,
+            'remaining_years': period_years - elapsed_in_period,
+            'end_date': current_start + self.PERIOD_TIMEDELTAS[planet_index]
+        }
+    
+    def current_dasha_from_timeline(self, timeline):
+        """Current dasha in get_current_dasha's format, taken from a life timeline (None past 100 years)"""
+        for period in timeline or ():
+            if period.is_current:
                 return {
-                    'current_planet': current_planet,
-                    'dasha_start_date': current_start,
-                    'total_period_years': period_years,
-                    'elapsed_years': years_to_account,
-                    'remaining_years': remaining_years,
-                    'end_date': current_start + timedelta(days=period_years * 365.25)
+                    'current_planet': period.planet,
+                    'dasha_start_date': period.start_date,
+                    'total_period_years': period.period_years,
+                    'elapsed_years': period.elapsed_years,
+                    'remaining_years': period.remaining_years,
+                    'end_date': period.end_date
                 }
-            
-            # Move to next dasha
-            years_to_account -= period_years
-            current_start += timedelta(days=period_years * 365.25)
-            start_index = (start_index + 1) % len(planet_sequence)
-        
         return None
     
     def get_complete_life_dasha_timeline(self, birth_date, birth_time):
@@ -157,8 +219,8 @@ class VimshottariDashaCalculator:
             return None
         
         timeline = []
-        birth_datetime = datetime.combine(birth_date, birth_time)
-        end_of_life = birth_datetime + timedelta(days=100 * 365.25)  # 100 years from birth
+        birth_datetime = dasha_info['birth_datetime']
+        end_of_life = birth_datetime + timedelta(days=100 * DAYS_PER_YEAR)  # 100 years from birth
         current_date = datetime.now()
         
         # Start from the birth dasha
@@ -167,71 +229,73 @@ class VimshottariDashaCalculator:
         remaining_at_birth = dasha_info['remaining_at_birth_years']
         
         # First period - the one active at birth
-        first_end = birth_datetime + timedelta(days=remaining_at_birth * 365.25)
+        first_end = dasha_info['dasha_end_date']
         
         # Check if this period is current, past, or future
         is_current = current_start <= current_date < first_end
         is_past = first_end <= current_date
         
         if is_current:
-            elapsed_since_start = (current_date - current_start).days / 365.25
-            elapsed_since_birth = (current_date - birth_datetime).days / 365.25
+            elapsed_since_start = (current_date - current_start).days / DAYS_PER_YEAR
+            elapsed_since_birth = (current_date - birth_datetime).days / DAYS_PER_YEAR
             remaining = remaining_at_birth - elapsed_since_birth
             
-            timeline.append({
-                'planet': current_planet,
-                'start_date': current_start,
-                'end_date': first_end,
-                'is_current': True,
-                'is_past': False,
-                'elapsed_years': elapsed_since_start,
-                'remaining_years': remaining,
-                'period_years': self.DASHA_PERIODS[current_planet]
-            })
+            timeline.append(DashaPeriod(
+                current_planet, current_start, first_end, True, False,
+                self.DASHA_PERIODS[current_planet], elapsed_since_start, remaining
+            ))
         else:
-            timeline.append({
-                'planet': current_planet,
-                'start_date': current_start,
-                'end_date': first_end,
-                'is_current': False,
-                'is_past': is_past,
-                'period_years': self.DASHA_PERIODS[current_planet]
-            })
-        
-        # Continue with subsequent dashas until 100 years
-        current_start_date = first_end
-        planet_sequence = list(self.DASHA_PERIODS.keys())
-        current_index = planet_sequence.index(current_planet)
-        
-        while current_start_date < end_of_life:
-            current_index = (current_index + 1) % len(planet_sequence)
-            planet = planet_sequence[current_index]
-            period_years = self.DASHA_PERIODS[planet]
-            end_date = current_start_date + timedelta(days=period_years * 365.25)
-            
-            # Check status relative to current date
-            is_current = current_start_date <= current_date < end_date
-            is_past = end_date <= current_date
-            
-            period_data = {
-                'planet': planet,
-                'start_date': current_start_date,
-                'end_date': end_date,
-                'is_current': is_current,
-                'is_past': is_past,
-                'period_years': period_years
-            }
-            
+            timeline.append(DashaPeriod(
+                current_planet, current_start, first_end, False, is_past,
+                self.DASHA_PERIODS[current_planet], None, None
+            ))
+        
+        # Continue with subsequent dashas until 100 years. One 120-year cycle always
+        # reaches past that, so all boundaries come from a single slice of the
+        # cumulative table, converted to dates in one vectorized step
+        start_index = self.PLANET_INDEX[current_planet] + 1
+        cycle = slice(start_index, start_index + len(self.PLANET_SEQUENCE))
+        planets = (self.PLANET_SEQUENCE * 2)[cycle]
+        periods = (self.PERIOD_YEARS * 2)[cycle]
+        end_offsets = np.array(self.CUMULATIVE_YEARS[cycle], dtype=np.int64) - self.CUMULATIVE_YEARS[start_index - 1]
+        
+        # Whole-year offsets in integer microseconds - no float rounding in the boundaries
+        first_end_us = np.datetime64(first_end, 'us')
+        start_dates = first_end_us + _years_to_timedelta64(end_offsets - np.array(periods, dtype=np.int64))
+        end_dates = first_end_us + _years_to_timedelta64(end_offsets)
+        
+        # Check status relative to current date: periods are contiguous and sorted, so one
+        # binary search splits them into past periods, the current one and future ones
+        now = np.datetime64(current_date, 'us')
+        in_life = start_dates < np.datetime64(end_of_life, 'us')
+        current_index = np.searchsorted(end_dates, now, side='right')
+        positions = np.arange(len(end_dates))
+        is_past_arr = positions < current_index
+        is_current_arr = (positions == current_index) & (start_dates <= now)
+        
+        # Start dates only grow, so the periods within 100 years are a prefix of the cycle
+        for planet, period_years, start_date, end_date, is_current, is_past in zip(
+            planets,
+            periods,
+            start_dates[in_life].tolist(),
+            end_dates[in_life].tolist(),
+            is_current_arr[in_life].tolist(),
+            is_past_arr[in_life].tolist()
+        ):
             # Add elapsed/remaining for current period
+            elapsed_years = remaining_years = None
             if is_current:
-                elapsed_years = (current_date - current_start_date).days / 365.25
+                elapsed_years = (current_date - start_date).days / DAYS_PER_YEAR
                 remaining_years = period_years - elapsed_years
-                period_data.update({
-                    'elapsed_years': elapsed_years,
-                    'remaining_years': remaining_years
-                })
             
-            timeline.append(period_data)
-            current_start_date = end_date
+            timeline.append(DashaPeriod(
+                planet, start_date, end_date, is_current, is_past,
+                period_years, elapsed_years, remaining_years
+            ))
         
         return timeline
+
+@st.cache_resource
+def get_dasha_calculator():
+    """Shared calculator instance - it holds no per-user state, so one per process is enough"""
+    return VimshottariDashaCalculator()
@@ -3,12 +3,42 @@ Planetary Afflictions Calculator for Vedic Astrology
 Calculates major afflictions like Sade Sathi, Kuja Dosha, etc. from birth to 100 years
 """
 
+import numpy as np
 import swisseph as swe
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from bisect import bisect_right
+from heapq import merge
+from operator import itemgetter
 import math
 
+@lru_cache(maxsize=50_000)
+def _swe_longitude(jd: float, planet_id: int) -> float:
+    """Planet longitude from Swiss Ephemeris, memoized per (Julian day, planet)
+    
+    Affliction scans revisit the same days for several checks, so each ephemeris
+    value is computed once per process. Callers round jd to keep keys stable.
+    """
+    return swe.calc_ut(jd, planet_id)[0][0]
+
 class PlanetaryAfflictionsCalculator:
+    # Fixed planet order of the longitude arrays returned by _all_longitudes
+    LONGITUDE_ORDER = ('sun', 'moon', 'mars', 'mercury', 'jupiter', 'venus', 'saturn', 'rahu', 'ketu')
+    LONGITUDE_INDEX = {planet: index for index, planet in enumerate(LONGITUDE_ORDER)}
+    
+    # Sade Sathi phase tables, indexed by cycle % 3 (the 4th cycle starts with Rising again)
+    SADE_SATHI_PHASES = ("Rising (Arohini)", "Peak (Madhya)", "Setting (Avarohi)")
+    SADE_SATHI_INTENSITIES = ("Moderate", "High", "Moderate")
+    SADE_SATHI_SATURN_HOUSES = (12, 1, 2)
+    SADE_SATHI_EFFECTS = (
+        "Initial challenges, career changes, new responsibilities, mild health issues",
+        "Maximum challenges, major life changes, health problems, relationship stress, financial constraints",
+        "Gradual relief, lessons learned, rebuilding phase, improved wisdom"
+    )
+    SADE_SATHI_EFFECTS_BY_PHASE = dict(zip(SADE_SATHI_PHASES, SADE_SATHI_EFFECTS))
+    SADE_SATHI_REMEDIES = "Saturday fasting, Hanuman Chalisa, Saturn mantras, donate black items, help elderly, wear blue sapphire (after consultation)"
+    
     def __init__(self):
         """Initialize the planetary afflictions calculator"""
         # Set ephemeris path
@@ -103,13 +133,13 @@ class PlanetaryAfflictionsCalculator:
     def get_planet_position(self, planet: str, jd: float) -> Dict:
         """Get planet position for given Julian day"""
         try:
+            jd_key = round(jd, 6)
             if planet == 'ketu':
                 # Ketu is 180° opposite to Rahu
-                rahu_pos = swe.calc_ut(jd, self.PLANETS['rahu'])[0][0]
+                rahu_pos = _swe_longitude(jd_key, self.PLANETS['rahu'])
                 longitude = (rahu_pos + 180) % 360
             else:
-                result = swe.calc_ut(jd, self.PLANETS[planet])
-                longitude = result[0][0]
+                longitude = _swe_longitude(jd_key, self.PLANETS[planet])
             
             # Convert to sign and degree
             sign_num = int(longitude // 30)
@@ -124,6 +154,23 @@ class PlanetaryAfflictionsCalculator:
         except Exception as e:
             return None
 
+    def _all_longitudes(self, jd: float) -> np.ndarray:
+        """Longitudes of all nine planets for one Julian day, in LONGITUDE_ORDER"""
+        jd_key = round(jd, 6)
+        calc = _swe_longitude
+        planets = self.PLANETS
+        longitudes = np.array([calc(jd_key, planets[planet]) for planet in self.LONGITUDE_ORDER[:-1]] + [0.0])
+        # Ketu is 180° opposite to Rahu
+        longitudes[-1] = (longitudes[-2] + 180.0) % 360.0
+        return longitudes
+
+    def _birth_longitudes(self, birth_date) -> Optional[np.ndarray]:
+        """All nine birth longitudes, or None if the ephemeris lookup fails"""
+        try:
+            return self._all_longitudes(self.julian_day(birth_date))
+        except Exception:
+            return None
+
     def get_sign_name(self, sign_num: int) -> str:
         """Get sign name from number"""
         signs = [
@@ -140,6 +187,11 @@ class PlanetaryAfflictionsCalculator:
 
     def calculate_sade_sathi_periods(self, birth_date) -> List[Dict]:
         """Calculate all 4 Sade Sathi periods from birth to 100 years"""
+        # Fresh dicts on every call, so callers can annotate them without touching the cache
+        return [dict(period) for period in _cached_sade_sathi_periods(birth_date)]
+
+    def _compute_sade_sathi_periods(self, birth_date) -> List[Dict]:
+        """Compute the Sade Sathi periods - use calculate_sade_sathi_periods, which memoizes this"""
         moon_sign = self.get_moon_sign(birth_date)
         if not moon_sign:
             return []
@@ -152,49 +204,40 @@ class PlanetaryAfflictionsCalculator:
         else:
             base_birth_date = birth_date
         
-        # Saturn completes one cycle in approximately 29.5 years
+        # Saturn completes one cycle in approximately 29.5 years (SATURN_CYCLE_YEARS in astro_kernels)
         # Each person experiences Sade Sathi 4 times in 100 years
-        saturn_cycle_years = 29.5
         sade_sathi_duration_years = 7.5
         
         # Calculate approximate ages when Sade Sathi occurs for this Moon sign
         # This is an approximation - actual timing depends on Saturn's exact position
         moon_sign_offset = (moon_sign - 1) * 2.5  # Each sign takes ~2.5 years for Saturn
+        moon_sign_name = self.get_sign_name(moon_sign)
         
-        for cycle in range(4):  # 4 Sade Sathi periods in lifetime
-            # Calculate start age for this cycle
-            start_age = (cycle * saturn_cycle_years) + moon_sign_offset
-            
-            # Ensure we don't go beyond 100 years
-            if start_age > 95:  # Leave room for 7.5 year duration
-                break
-            
-            # Calculate actual dates
-            start_date = base_birth_date + timedelta(days=int(start_age * 365.25))
-            end_date = start_date + timedelta(days=int(sade_sathi_duration_years * 365.25))
+        # Day offsets for the 4 Sade Sathi periods in a lifetime, computed in one compiled pass;
+        # cycles starting after 95 are dropped to leave room for the 7.5 year duration
+        from src.utils.astro_kernels import saturn_transit_day_offsets
+        start_ages, start_days, end_days = saturn_transit_day_offsets(moon_sign_offset, 95.0, sade_sathi_duration_years)
+        
+        for cycle, (start_age, start_day, end_day) in enumerate(zip(start_ages.tolist(), start_days.tolist(), end_days.tolist())):
+            start_date = base_birth_date + timedelta(days=start_day)
+            end_date = base_birth_date + timedelta(days=end_day)
             
             # Determine phase based on cycle progression
-            phases = ["Rising (Arohini)", "Peak (Madhya)", "Setting (Avarohi)"]
-            phase_index = cycle % 3  # Cycle through phases
-            if cycle == 3:  # 4th cycle
-                phase_index = 0  # Start with Rising again
-            
-            phase = phases[phase_index]
-            intensity = "High" if phase_index == 1 else "Moderate"
+            phase_index = cycle % 3
             
             sade_sathi_periods.append({
                 'name': 'Sade Sathi',
-                'phase': phase,
-                'intensity': intensity,
+                'phase': self.SADE_SATHI_PHASES[phase_index],
+                'intensity': self.SADE_SATHI_INTENSITIES[phase_index],
                 'start_date': start_date,
                 'end_date': end_date,
                 'start_age': round(start_age, 1),
                 'end_age': round(start_age + sade_sathi_duration_years, 1),
                 'duration_years': sade_sathi_duration_years,
-                'moon_sign': self.get_sign_name(moon_sign),
-                'saturn_house': [12, 1, 2][phase_index],
-                'effects': self.get_sade_sathi_effects(phase),
-                'remedies': self.get_sade_sathi_remedies(phase),
+                'moon_sign': moon_sign_name,
+                'saturn_house': self.SADE_SATHI_SATURN_HOUSES[phase_index],
+                'effects': self.SADE_SATHI_EFFECTS[phase_index],
+                'remedies': self.SADE_SATHI_REMEDIES,
                 'cycle_number': cycle + 1
             })
         
@@ -202,6 +245,10 @@ class PlanetaryAfflictionsCalculator:
 
     def calculate_ashtama_shani_periods(self, birth_date) -> List[Dict]:
         """Calculate Ashtama Shani (8th house Saturn transit) periods"""
+        return [dict(period) for period in _cached_ashtama_shani_periods(birth_date)]
+
+    def _compute_ashtama_shani_periods(self, birth_date) -> List[Dict]:
+        """Compute the Ashtama Shani periods - use calculate_ashtama_shani_periods, which memoizes this"""
         moon_sign = self.get_moon_sign(birth_date)
         if not moon_sign:
             return []
@@ -216,7 +263,6 @@ class PlanetaryAfflictionsCalculator:
         
         # Saturn takes about 2.5 years to transit through each sign
         # Ashtama Shani occurs every 29.5 years when Saturn is in 8th house from Moon
-        saturn_cycle_years = 29.5
         ashtama_duration_years = 2.5
         
         # Calculate when Saturn will be in 8th house from Moon sign
@@ -225,17 +271,14 @@ class PlanetaryAfflictionsCalculator:
         # Calculate approximate timing based on Moon sign
         moon_sign_offset = ((eighth_house_sign - 1) * 2.5)  # Each sign takes ~2.5 years
         
-        for cycle in range(4):  # 4 cycles in 100+ years
-            # Calculate start age for this Ashtama Shani period
-            start_age = (cycle * saturn_cycle_years) + moon_sign_offset
-            
-            # Ensure we don't go beyond 100 years
-            if start_age > 97.5:  # Leave room for 2.5 year duration
-                break
-            
-            # Calculate actual dates
-            start_date = base_birth_date + timedelta(days=int(start_age * 365.25))
-            end_date = start_date + timedelta(days=int(ashtama_duration_years * 365.25))
+        # Day offsets for up to 4 cycles in 100+ years, computed in one compiled pass;
+        # cycles starting after 97.5 are dropped to leave room for the 2.5 year duration
+        from src.utils.astro_kernels import saturn_transit_day_offsets
+        start_ages, start_days, end_days = saturn_transit_day_offsets(moon_sign_offset, 97.5, ashtama_duration_years)
+        
+        for cycle, (start_age, start_day, end_day) in enumerate(zip(start_ages.tolist(), start_days.tolist(), end_days.tolist())):
+            start_date = base_birth_date + timedelta(days=start_day)
+            end_date = base_birth_date + timedelta(days=end_day)
             
             ashtama_periods.append({
                 'name': 'Ashtama Shani',
@@ -254,23 +297,18 @@ class PlanetaryAfflictionsCalculator:
         
         return ashtama_periods
 
-    def check_kuja_dosha(self, birth_date) -> Dict:
-        """Check for Kuja Dosha (Manglik) in birth chart"""
-        jd = self.julian_day(birth_date)
-        mars_pos = self.get_planet_position('mars', jd)
+    def check_kuja_dosha(self, birth_date, longitudes: Optional[np.ndarray] = None) -> Dict:
+        """Check for Kuja Dosha (Manglik) in birth chart; longitudes may be passed from _all_longitudes"""
+        if longitudes is None:
+            longitudes = self._birth_longitudes(birth_date)
+            if longitudes is None:
+                return None
         
-        if not mars_pos:
-            return None
-        
-        mars_sign = mars_pos['sign']
+        mars_sign = int(longitudes[self.LONGITUDE_INDEX['mars']] // 30) + 1
         
         # Get Ascendant (approximate - would need birth time for accuracy)
         # For simplicity, using Sun sign as reference
-        sun_pos = self.get_planet_position('sun', jd)
-        if not sun_pos:
-            return None
-        
-        ascendant_sign = sun_pos['sign']  # Approximation
+        ascendant_sign = int(longitudes[self.LONGITUDE_INDEX['sun']] // 30) + 1  # Approximation
         
         # Calculate house position of Mars from Ascendant
         mars_house = ((mars_sign - ascendant_sign) % 12) + 1
@@ -312,43 +350,22 @@ class PlanetaryAfflictionsCalculator:
             'marriage_compatibility': 'Normal marriage compatibility'
         }
 
-    def check_kala_sarpa_dosha(self, birth_date) -> Dict:
-        """Check for Kala Sarpa Dosha in birth chart"""
-        jd = self.julian_day(birth_date)
-        
-        # Get all planet positions
-        planets = ['sun', 'moon', 'mars', 'mercury', 'jupiter', 'venus', 'saturn']
-        planet_positions = {}
-        
-        for planet in planets:
-            pos = self.get_planet_position(planet, jd)
-            if pos:
-                planet_positions[planet] = pos['longitude']
-        
-        # Get Rahu position
-        rahu_pos = self.get_planet_position('rahu', jd)
-        ketu_pos = self.get_planet_position('ketu', jd)
-        
-        if not rahu_pos or not ketu_pos or len(planet_positions) < 7:
-            return None
-        
-        rahu_long = rahu_pos['longitude']
-        ketu_long = ketu_pos['longitude']
-        
-        # Check if all planets are between Rahu and Ketu
-        planets_between_nodes = 0
-        total_planets = len(planet_positions)
-        
-        for planet, longitude in planet_positions.items():
-            # Check if planet is between Rahu and Ketu
-            if rahu_long < ketu_long:
-                if rahu_long <= longitude <= ketu_long:
-                    planets_between_nodes += 1
-            else:  # Rahu-Ketu axis crosses 0°
-                if longitude >= rahu_long or longitude <= ketu_long:
-                    planets_between_nodes += 1
-        
-        has_kala_sarpa = planets_between_nodes == total_planets
+    def check_kala_sarpa_dosha(self, birth_date, longitudes: Optional[np.ndarray] = None) -> Dict:
+        """Check for Kala Sarpa Dosha in birth chart; longitudes may be passed from _all_longitudes"""
+        if longitudes is None:
+            longitudes = self._birth_longitudes(birth_date)
+            if longitudes is None:
+                return None
+        
+        # Seven planets, then Rahu and Ketu
+        planet_longitudes = longitudes[:7]
+        rahu_long = longitudes[self.LONGITUDE_INDEX['rahu']]
+        ketu_long = longitudes[self.LONGITUDE_INDEX['ketu']]
+        
+        # Check if all planets are between Rahu and Ketu: measured from Rahu, each planet must
+        # lie within the Rahu-to-Ketu arc, which also covers the axis crossing 0°
+        arc = (ketu_long - rahu_long) % 360.0
+        has_kala_sarpa = bool((((planet_longitudes - rahu_long) % 360.0) <= arc).all())
         
         if has_kala_sarpa:
             # Determine type based on which node is in which house
@@ -356,8 +373,8 @@ class PlanetaryAfflictionsCalculator:
                 'name': 'Kala Sarpa Dosha',
                 'present': True,
                 'intensity': 'High',
-                'rahu_sign': rahu_pos['sign_name'],
-                'ketu_sign': ketu_pos['sign_name'],
+                'rahu_sign': self.get_sign_name(int(rahu_long // 30) + 1),
+                'ketu_sign': self.get_sign_name(int(ketu_long // 30) + 1),
                 'effects': 'Obstacles in life progress, delays in success, mental agitation, but also spiritual growth',
                 'remedies': 'Rahu-Ketu mantras, visit Kalahasti temple, donate to serpent deities, perform Sarpa Dosha Nivarana',
                 'positive_aspects': 'Strong intuition, spiritual inclinations, ability to overcome major obstacles'
@@ -383,25 +400,24 @@ class PlanetaryAfflictionsCalculator:
 
     def get_sade_sathi_effects(self, phase: str) -> str:
         """Get effects based on Sade Sathi phase"""
-        effects = {
-            "Rising (Arohini)": "Initial challenges, career changes, new responsibilities, mild health issues",
-            "Peak (Madhya)": "Maximum challenges, major life changes, health problems, relationship stress, financial constraints",
-            "Setting (Avarohi)": "Gradual relief, lessons learned, rebuilding phase, improved wisdom"
-        }
-        return effects.get(phase, "General Sade Sathi effects")
+        return self.SADE_SATHI_EFFECTS_BY_PHASE.get(phase, "General Sade Sathi effects")
 
     def get_sade_sathi_remedies(self, phase: str) -> str:
         """Get remedies based on Sade Sathi phase"""
-        return "Saturday fasting, Hanuman Chalisa, Saturn mantras, donate black items, help elderly, wear blue sapphire (after consultation)"
+        return self.SADE_SATHI_REMEDIES
 
     def get_complete_afflictions_timeline(self, birth_date) -> Dict:
         """Get complete afflictions timeline from birth to 100 years"""
+        # Birth longitudes are computed once and shared by the dosha checks
+        longitudes = self._birth_longitudes(birth_date)
+        has_longitudes = longitudes is not None
+        
         timeline = {
             'birth_date': birth_date,
-        'sade_sathi_periods': self.calculate_sade_sathi_periods(birth_date),
+            'sade_sathi_periods': self.calculate_sade_sathi_periods(birth_date),
             'ashtama_shani_periods': self.calculate_ashtama_shani_periods(birth_date),
-            'kuja_dosha': self.check_kuja_dosha(birth_date),
-            'kala_sarpa_dosha': self.check_kala_sarpa_dosha(birth_date),
+            'kuja_dosha': self.check_kuja_dosha(birth_date, longitudes) if has_longitudes else None,
+            'kala_sarpa_dosha': self.check_kala_sarpa_dosha(birth_date, longitudes) if has_longitudes else None,
             'summary': {}
         }
         
@@ -420,23 +436,29 @@ class PlanetaryAfflictionsCalculator:
         
         return timeline
 
+    @staticmethod
+    def _active_period(periods: List[Dict], current_date) -> Optional[Dict]:
+        """The period containing current_date, if any; periods are in start order and never overlap"""
+        index = bisect_right([period['start_date'] for period in periods], current_date) - 1
+        if index >= 0 and current_date <= periods[index]['end_date']:
+            return periods[index]
+        return None
+
+    @staticmethod
+    def _periods_starting_between(periods: List[Dict], after, until) -> List[Dict]:
+        """Periods starting in (after, until]; periods are in start order"""
+        starts = [period['start_date'] for period in periods]
+        return periods[bisect_right(starts, after):bisect_right(starts, until)]
+
     def get_current_afflictions(self, birth_date) -> List[Dict]:
         """Get currently active afflictions"""
         current_date = datetime.now()
         current_afflictions = []
         
-        # Check current Sade Sathi
-        sade_sathi_periods = self.calculate_sade_sathi_periods(birth_date)
-        for period in sade_sathi_periods:
-            if period['start_date'] <= current_date <= period['end_date']:
-                period['status'] = 'Active Now'
-                period['remaining_days'] = (period['end_date'] - current_date).days
-                current_afflictions.append(period)
-        
-        # Check current Ashtama Shani
-        ashtama_periods = self.calculate_ashtama_shani_periods(birth_date)
-        for period in ashtama_periods:
-            if period['start_date'] <= current_date <= period['end_date']:
+        # Check current Sade Sathi, then current Ashtama Shani
+        for periods in (self.calculate_sade_sathi_periods(birth_date), self.calculate_ashtama_shani_periods(birth_date)):
+            period = self._active_period(periods, current_date)
+            if period:
                 period['status'] = 'Active Now'
                 period['remaining_days'] = (period['end_date'] - current_date).days
                 current_afflictions.append(period)
@@ -447,25 +469,26 @@ class PlanetaryAfflictionsCalculator:
         """Get upcoming afflictions in next few years"""
         current_date = datetime.now()
         future_date = current_date + timedelta(days=365 * years_ahead)
-        upcoming_afflictions = []
-        
-        # Check upcoming Sade Sathi
-        sade_sathi_periods = self.calculate_sade_sathi_periods(birth_date)
-        for period in sade_sathi_periods:
-            if current_date < period['start_date'] <= future_date:
-                period['status'] = 'Upcoming'
-                period['days_until_start'] = (period['start_date'] - current_date).days
-                upcoming_afflictions.append(period)
-        
-        # Check upcoming Ashtama Shani
-        ashtama_periods = self.calculate_ashtama_shani_periods(birth_date)
-        for period in ashtama_periods:
-            if current_date < period['start_date'] <= future_date:
-                period['status'] = 'Upcoming'
-                period['days_until_start'] = (period['start_date'] - current_date).days
-                upcoming_afflictions.append(period)
-        
-        # Sort by start date
-        upcoming_afflictions.sort(key=lambda x: x['start_date'])
+        
+        upcoming_sade_sathi = self._periods_starting_between(self.calculate_sade_sathi_periods(birth_date), current_date, future_date)
+        upcoming_ashtama = self._periods_starting_between(self.calculate_ashtama_shani_periods(birth_date), current_date, future_date)
+        
+        # Both lists are already in start order, so merging keeps the result sorted by start date
+        upcoming_afflictions = list(merge(upcoming_sade_sathi, upcoming_ashtama, key=itemgetter('start_date')))
+        for period in upcoming_afflictions:
+            period['status'] = 'Upcoming'
+            period['days_until_start'] = (period['start_date'] - current_date).days
         
         return upcoming_afflictions
+
+# The timeline, current and upcoming views all need the same Saturn periods for a birth date,
+# so they are computed once per process; birth dates (date or datetime) are hashable keys
+@lru_cache(maxsize=256)
+def _cached_sade_sathi_periods(birth_date) -> Tuple[Dict, ...]:
+    """Sade Sathi periods for a birth date, memoized - callers must copy before mutating"""
+    return tuple(PlanetaryAfflictionsCalculator()._compute_sade_sathi_periods(birth_date))
+
+@lru_cache(maxsize=256)
+def _cached_ashtama_shani_periods(birth_date) -> Tuple[Dict, ...]:
+    """Ashtama Shani periods for a birth date, memoized - callers must copy before mutating"""
+    return tuple(PlanetaryAfflictionsCalculator()._compute_ashtama_shani_periods(birth_date))
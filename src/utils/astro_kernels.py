@@ -0,0 +1,43 @@
+"""
+Numeric kernels for astrological date arithmetic.
+Compiled with numba when it is installed; otherwise the same code runs as plain Python/NumPy.
+Import this module at first use rather than at page load - numba's import is slow.
+Explicit signatures make numba compile at import (or load from its on-disk cache) instead of on the first call.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator - returns the function unchanged when numba is unavailable"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Saturn transit timing: one return every ~29.5 years, at most four per 100-year lifetime
+SATURN_CYCLE_YEARS = 29.5
+MAX_SATURN_CYCLES = 4
+DAYS_PER_YEAR = 365.25
+
+@njit('Tuple((float64[:], int64[:], int64[:]))(float64, float64, float64)', cache=True)
+def saturn_transit_day_offsets(first_start_age, last_start_age, duration_years):
+    """Start ages and start/end day offsets from birth for each Saturn cycle starting no later than last_start_age"""
+    start_ages = np.empty(MAX_SATURN_CYCLES, dtype=np.float64)
+    start_days = np.empty(MAX_SATURN_CYCLES, dtype=np.int64)
+    end_days = np.empty(MAX_SATURN_CYCLES, dtype=np.int64)
+    duration_days = int(duration_years * DAYS_PER_YEAR)
+    count = 0
+    for cycle in range(MAX_SATURN_CYCLES):
+        start_age = (cycle * SATURN_CYCLE_YEARS) + first_start_age
+        if start_age > last_start_age:
+            break
+        start_ages[count] = start_age
+        start_days[count] = int(start_age * DAYS_PER_YEAR)
+        end_days[count] = start_days[count] + duration_days
+        count += 1
+    return start_ages[:count], start_days[:count], end_days[:count]
@@ -5,8 +5,8 @@ This module consolidates frequently used logic patterns.
 
 import streamlit as st
 import os
+import threading
 from datetime import datetime, time
-from langchain_community.llms import Ollama
 
 # =============================================================================
 # DATE AND TIME UTILITIES
@@ -95,7 +95,40 @@ def create_birth_data_dict(birth_date, birth_time, location_data, hour=None, min
             'location': {'place_string': location_data or ''}
         })
     
-    return birth_data
+    return normalize_birth_data(birth_data)
+
+def normalize_birth_data(birth_data):
+    """Resolve the prompt-facing location fields of a birth data dict once
+    
+    'location_str' holds the place description (with coordinates when known) used by
+    the AI prompts; coordinates may sit on the location dict itself or under its
+    'coordinates' entry. The flat 'latitude'/'longitude' keys are left as given, since
+    the chart code picks its Julian day method from them.
+    """
+    normalized = dict(birth_data)
+    location_data = birth_data.get('location')
+    
+    if isinstance(location_data, dict) and location_data.get('city'):
+        coordinates = location_data.get('coordinates') or {}
+        latitude = location_data.get('latitude')
+        longitude = location_data.get('longitude')
+        if latitude is None:
+            latitude = coordinates.get('latitude')
+        if longitude is None:
+            longitude = coordinates.get('longitude')
+        
+        city, state, country = location_data['city'], location_data.get('state', ''), location_data.get('country', '')
+        location_str = f"{city}, {state}, {country}" if state else f"{city}, {country}"
+        if latitude is not None and longitude is not None:
+            location_str += f" (Lat: {latitude:.4f}°, Long: {longitude:.4f}°)"
+    else:
+        location_str = birth_data.get('place') or 'Not specified'
+    
+    normalized.update({
+        'timezone_offset': float(birth_data.get('timezone_offset') or 0),
+        'location_str': location_str
+    })
+    return normalized
 
 def validate_birth_inputs(birth_date, birth_time, location_data):
     """Comprehensive birth data validation with enhanced location support"""
@@ -178,35 +211,191 @@ def clear_session_data():
 # AI MODEL UTILITIES
 # =============================================================================
 
-def setup_ai_model(model_name="llama3.2:latest", temperature=0.7, max_tokens=1000):
+OLLAMA_BASE_URL = "http://localhost:11434"
+DEFAULT_MODEL_NAME = "llama3.2:latest"
+
+@st.cache_resource(show_spinner=False)
+def _get_ollama_session():
+    """Pooled HTTP session for direct Ollama calls, shared across reruns and sessions"""
+    import requests
+    return requests.Session()
+
+def invoke_ollama(prompt, model_name=DEFAULT_MODEL_NAME, temperature=0.7, session=None):
+    """
+    Complete a single prompt through Ollama's REST API without the LangChain wrapper; raises on failure.
+    Uses the shared session unless one is given; worker threads pass their own.
+    """
+    response = (session or _get_ollama_session()).post(
+        f"{OLLAMA_BASE_URL}/api/generate",
+        json={
+            "model": model_name,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": temperature}
+        },
+        timeout=300
+    )
+    response.raise_for_status()
+    return response.json()["response"]
+
+@st.cache_resource(show_spinner=False)
+def _create_ollama_llm(model_name, temperature):
+    """Build the Ollama client once per (model, temperature); failures raise, so they are never cached"""
+    # Imported here so pages that never call the model skip langchain_community's import cost
+    from langchain_community.llms import Ollama
+    return Ollama(
+        model=model_name,
+        base_url=OLLAMA_BASE_URL,
+        temperature=temperature
+    )
+
+def setup_ai_model(model_name=DEFAULT_MODEL_NAME, temperature=0.7, max_tokens=1000):
     """Setup AI model with consistent configuration using Ollama"""
     try:
-        # Use Ollama instead of OpenAI
-        llm = Ollama(
-            model=model_name,
-            base_url="http://localhost:11434",
-            temperature=temperature
-        )
-        return llm
+        # Use Ollama instead of OpenAI; the client is shared across calls and sessions
+        return _create_ollama_llm(model_name, temperature)
     except Exception as e:
         st.error(f"⚠️ Error setting up Ollama model: {str(e)}")
         st.info("💡 Make sure Ollama is running and the model is installed")
         st.info(f"💡 Run: ollama pull {model_name}")
         return None
 
+def invoke_ai_model(prompt, session=None):
+    """Invoke the AI model without a spinner; worker threads pass their own HTTP session"""
+    try:
+        return invoke_ollama(prompt, session=session)
+    except Exception as e:
+        return f"Unable to generate response at this time. Error: {str(e)}"
+
 def generate_ai_response(prompt, spinner_text="🔮 Generating response..."):
     """Generate AI response with error handling"""
+    with st.spinner(spinner_text):
+        return invoke_ai_model(prompt)
+
+def stream_ai_model(prompt):
+    """Yield the AI response in chunks; raises on failure, so callers can tell a partial response from a complete one"""
     llm = setup_ai_model()
     if not llm:
-        return "Unable to generate response. AI service unavailable."
+        raise RuntimeError("AI service unavailable.")
     
+    for chunk in llm.stream(prompt):
+        yield chunk if isinstance(chunk, str) else str(chunk)
+
+def generate_ai_response_stream(prompt):
+    """Yield the AI response in chunks as the model produces them"""
     try:
-        with st.spinner(spinner_text):
-            response = llm.invoke(prompt)
-            # Ollama returns a string directly, not an object with .content
-            return response if isinstance(response, str) else str(response)
+        yield from stream_ai_model(prompt)
     except Exception as e:
-        return f"Unable to generate response at this time. Error: {str(e)}"
+        yield f"Unable to generate response at this time. Error: {str(e)}"
+
+def split_stream_sections(chunks, count, marker):
+    """Split one streamed response into `count` section streams, to be consumed in order
+    
+    Text that could be the start of a marker split across chunks is held back until
+    the next chunk arrives. The last section keeps any further markers verbatim.
+    """
+    chunks = iter(chunks)
+    pending = [""]
+    
+    def section(is_last):
+        buffer = pending[0]
+        while True:
+            index = -1 if is_last else buffer.find(marker)
+            if index != -1:
+                if buffer[:index]:
+                    yield buffer[:index]
+                pending[0] = buffer[index + len(marker):]
+                return
+            
+            keep = 0 if is_last else len(marker) - 1
+            if len(buffer) > keep:
+                yield buffer[:len(buffer) - keep]
+                buffer = buffer[len(buffer) - keep:]
+            
+            chunk = next(chunks, None)
+            if chunk is None:
+                if buffer:
+                    yield buffer
+                pending[0] = ""
+                return
+            buffer += chunk
+    
+    return [section(i == count - 1) for i in range(count)]
+
+RAG_RESPONSE_TTL_SECONDS = 3600
+RAG_RESPONSE_MAX_ENTRIES = 500
+_rag_response_store_lock = threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def get_rag_response_store():
+    """Successful multi-method RAG results keyed by question and birth data, shared across sessions"""
+    return {}
+
+def get_cached_rag_response(question, birth_data=None):
+    """
+    Multi-method RAG result for a question and birth data, reused for repeat questions for an hour.
+    Only answers are kept, so a failed lookup runs again on the next ask. A fresh lookup shows its
+    progress messages as it runs; a reused answer shows none, so no stale messages are replayed.
+    """
+    from src.utils.multi_method_rag import get_multi_method_rag
+    
+    # The RAG prompt includes the birth data as text, so the same text gives the same answer
+    key = (question, str(birth_data) if birth_data else None)
+    store = get_rag_response_store()
+    with _rag_response_store_lock:
+        entry = store.get(key)
+    if entry and (datetime.now() - entry[0]).total_seconds() < RAG_RESPONSE_TTL_SECONDS:
+        return entry[1]
+    
+    result = get_multi_method_rag().get_response(question, birth_data)
+    if result.get('method') != 'error':
+        with _rag_response_store_lock:
+            store.pop(key, None)
+            store[key] = (datetime.now(), result)
+            # Oldest entries go first once the store is full
+            while len(store) > RAG_RESPONSE_MAX_ENTRIES:
+                del store[next(iter(store))]
+    return result
+
+def build_fun_chat_fallback_prompt(question):
+    """Maha Prabhu persona prompt used when the multi-method RAG system is unavailable"""
+    return f"""
+            You are Maha Prabhu, a fun, engaging, and wise Vedic astrology guru with a playful personality. 
+            Answer the user's question in an entertaining yet informative way.
+            
+            User Question: {question}
+            
+            Guidelines for your response:
+            1. Start with "Hey Dude," as your signature greeting
+            2. Be fun, conversational, and engaging 
+            3. Use emojis and creative language (🌟✨🔮🚀🌙💫)
+            4. Include relevant astrological insights when applicable
+            5. Keep it light-hearted but educational
+            6. Use analogies, metaphors, and storytelling when appropriate
+            7. Add a touch of humor while respecting the wisdom of astrology
+            8. End with mystical encouragement to ask more questions
+            
+            Make your response engaging, informative, and fun to read as Maha Prabhu!
+            """
+
+def stream_fun_chat_rag_response(question, birth_data=None):
+    """
+    Yield the fun chat answer for st.write_stream.
+    RAG answers arrive whole; the fallback persona response streams as the model writes it.
+    """
+    try:
+        from src.utils.multi_method_rag import get_multi_method_rag
+        rag_available = get_multi_method_rag().is_available()
+    except ImportError:
+        rag_available = False
+    except Exception as e:
+        yield f"🌙 Oops! The cosmic signals seem a bit fuzzy right now. Try asking again! ✨ (Error: {str(e)})"
+        return
+    
+    if rag_available:
+        yield generate_fun_chat_rag_response(question, birth_data)
+    else:
+        yield from generate_ai_response_stream(build_fun_chat_fallback_prompt(question))
 
 def generate_fun_chat_rag_response(question, birth_data=None, session_id="fun_chat_default", spinner_text="🌟 Consulting the cosmic wisdom..."):
     """Generate response using multi-method RAG with cosine similarity thresholds"""
@@ -216,7 +405,7 @@ def generate_fun_chat_rag_response(question, birth_data=None, session_id="fun_ch
         
         multi_rag = get_multi_method_rag()
         if multi_rag.is_available():
-            result = multi_rag.get_response(question, birth_data, session_id)
+            result = get_cached_rag_response(question.strip(), birth_data)
             
             # Store method info in session state for UI display
             if 'last_rag_method' not in st.session_state:
@@ -231,25 +420,7 @@ def generate_fun_chat_rag_response(question, birth_data=None, session_id="fun_ch
             return result.get('response', 'No response generated')
         else:
             # Fallback to regular AI response with Maha Prabhu persona
-            fallback_prompt = f"""
-            You are Maha Prabhu, a fun, engaging, and wise Vedic astrology guru with a playful personality. 
-            Answer the user's question in an entertaining yet informative way.
-            
-            User Question: {question}
-            
-            Guidelines for your response:
-            1. Start with "Hey Dude," as your signature greeting
-            2. Be fun, conversational, and engaging 
-            3. Use emojis and creative language (🌟✨🔮🚀🌙💫)
-            4. Include relevant astrological insights when applicable
-            5. Keep it light-hearted but educational
-            6. Use analogies, metaphors, and storytelling when appropriate
-            7. Add a touch of humor while respecting the wisdom of astrology
-            8. End with mystical encouragement to ask more questions
-            
-            Make your response engaging, informative, and fun to read as Maha Prabhu!
-            """
-            return generate_ai_response(fallback_prompt, spinner_text)
+            return generate_ai_response(build_fun_chat_fallback_prompt(question), spinner_text)
                 
     except ImportError:
         # If multi-method RAG dependencies aren't available, use regular AI response
@@ -330,7 +501,7 @@ def validate_environment():
     # Check Ollama availability instead of OpenAI API key
     try:
         import requests
-        response = requests.get("http://localhost:11434/api/version", timeout=2)
+        response = requests.get(f"{OLLAMA_BASE_URL}/api/version", timeout=2)
         if response.status_code != 200:
             issues.append("Ollama server not accessible at localhost:11434")
     except:
@@ -353,7 +524,8 @@ SESSION_KEYS = {
     'BIRTH_DATA': 'birth_data',
     'CHART_CALCULATED': 'chart_calculated',
     'PREDICTIONS_GENERATED': 'predictions_generated',
-    'QUICK_PREDICTION': 'quick_prediction'
+    'QUICK_PREDICTION': 'quick_prediction',
+    'DETAILED_PREDICTION': 'detailed_prediction'
 }
 
 # UI Colors and styling constants
@@ -720,12 +720,12 @@ Feel free to ask me anything else - I'm always here to help guide you on your sp
         """Check if the system is ready to use"""
         return self.is_ready
 
-# Global instance
-_multi_method_rag = None
-
+@st.cache_resource(show_spinner=False)
 def get_multi_method_rag() -> MultiMethodRAG:
-    """Get global MultiMethodRAG instance"""
-    global _multi_method_rag
-    if _multi_method_rag is None:
-        _multi_method_rag = MultiMethodRAG()
-    return _multi_method_rag
+    """Get the shared MultiMethodRAG instance - the ChromaDB client is set up once per process"""
+    return MultiMethodRAG()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_cached_knowledge_base_size() -> int:
+    """Knowledge base document count, refreshed every few minutes instead of on every rerun"""
+    return get_multi_method_rag().get_knowledge_base_size()
@@ -21,6 +21,17 @@ sys.path.append(os.path.join(project_root, 'config'))
 from src.utils.ui_components import render_sidebar_navigation
 from src.utils.common import get_session_value, SESSION_KEYS
 
+@st.cache_data(show_spinner=False)
+def read_stylesheet(filename):
+    """Read a stylesheet from assets/styles once per process"""
+    styles_dir = os.path.join(os.path.dirname(os.path.dirname(current_dir)), 'assets', 'styles')
+    with open(os.path.join(styles_dir, filename)) as f:
+        return f.read()
+
+def apply_stylesheet(filename):
+    """Inject a cached stylesheet from assets/styles into the page"""
+    st.markdown(f"<style>{read_stylesheet(filename)}</style>", unsafe_allow_html=True)
+
 def setup_page(title, icon, layout="wide"):
     """
     Standard page configuration for all pages
@@ -160,9 +171,7 @@ def render_coming_soon_section(title, features_list, icon="🚧"):
     """
     st.subheader(title)
     st.info(f"{icon} Feature coming soon!")
-    st.write("**This section will include:**")
-    for feature in features_list:
-        st.write(f"- {feature}")
+    st.markdown("**This section will include:**\n" + "\n".join(f"- {feature}" for feature in features_list))
 
 def render_standard_disclaimer():
     """
@@ -18,7 +18,8 @@ def initialize_session_state():
         SESSION_KEYS['BIRTH_DATA']: {},
         SESSION_KEYS['CHART_CALCULATED']: False,
         SESSION_KEYS['PREDICTIONS_GENERATED']: False,
-        SESSION_KEYS['QUICK_PREDICTION']: ""
+        SESSION_KEYS['QUICK_PREDICTION']: "",
+        SESSION_KEYS['DETAILED_PREDICTION']: None
     }
     
     for key, default_value in session_defaults.items():
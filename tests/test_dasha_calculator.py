@@ -0,0 +1,100 @@
+"""
+Current-dasha lookup: the cumulative-table binary search against the period-by-period walk it replaced
+"""
+
+import random
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from src.calculations import dasha_calculator
+from src.calculations.dasha_calculator import DAYS_PER_YEAR, VimshottariDashaCalculator
+
+BIRTH_DATETIME = datetime(1990, 1, 1, 6, 0)
+
+
+def reference_current_dasha(ruling_planet, remaining_at_birth, elapsed_years):
+    """Walk the periods one at a time from the planet after the birth dasha"""
+    periods = VimshottariDashaCalculator.DASHA_PERIODS
+    planet_sequence = list(periods.keys())
+    index = (planet_sequence.index(ruling_planet) + 1) % len(planet_sequence)
+    years_to_account = elapsed_years - remaining_at_birth
+    start_offset = remaining_at_birth
+    while years_to_account > 0:
+        planet = planet_sequence[index]
+        if years_to_account <= periods[planet]:
+            return planet, start_offset, years_to_account
+        years_to_account -= periods[planet]
+        start_offset += periods[planet]
+        index = (index + 1) % len(planet_sequence)
+    return None
+
+
+def current_dasha(monkeypatch, ruling_planet, remaining_at_birth, elapsed_days):
+    """Run get_current_dasha for a birth dasha and a number of days elapsed since birth"""
+    calculator = VimshottariDashaCalculator()
+    dasha_end_date = BIRTH_DATETIME + timedelta(days=remaining_at_birth * DAYS_PER_YEAR)
+    dasha_info = {
+        'ruling_planet': ruling_planet,
+        'birth_datetime': BIRTH_DATETIME,
+        'dasha_start_date': BIRTH_DATETIME,
+        'dasha_end_date': dasha_end_date,
+        'remaining_at_birth_years': remaining_at_birth,
+    }
+    monkeypatch.setattr(calculator, 'calculate_dasha_start_date', lambda birth_date, birth_time: dasha_info)
+
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return BIRTH_DATETIME + timedelta(days=elapsed_days)
+
+    monkeypatch.setattr(dasha_calculator, 'datetime', FixedDatetime)
+    return calculator.get_current_dasha(BIRTH_DATETIME.date(), time(6, 0))
+
+
+def assert_matches_reference(monkeypatch, ruling_planet, remaining_at_birth, elapsed_days):
+    elapsed_years = elapsed_days / DAYS_PER_YEAR
+    if elapsed_years <= remaining_at_birth:
+        return
+    planet, start_offset, elapsed_in_period = reference_current_dasha(ruling_planet, remaining_at_birth, elapsed_years)
+    result = current_dasha(monkeypatch, ruling_planet, remaining_at_birth, elapsed_days)
+
+    assert result['current_planet'] == planet
+    assert result['elapsed_years'] == pytest.approx(elapsed_in_period, abs=1e-9)
+    expected_start = BIRTH_DATETIME + timedelta(days=start_offset * DAYS_PER_YEAR)
+    assert abs(result['dasha_start_date'] - expected_start) < timedelta(seconds=1)
+
+
+@pytest.mark.parametrize('ruling_planet', VimshottariDashaCalculator.PLANET_SEQUENCE)
+def test_period_boundaries_match_reference(monkeypatch, ruling_planet):
+    """A period ending exactly now is still the current one, in every cycle"""
+    periods = VimshottariDashaCalculator.DASHA_PERIODS
+    planet_sequence = list(periods.keys())
+    index = planet_sequence.index(ruling_planet)
+    boundary_years = 0
+    for _ in range(3 * len(planet_sequence)):
+        index = (index + 1) % len(planet_sequence)
+        boundary_years += periods[planet_sequence[index]]
+        elapsed_days = int(boundary_years * DAYS_PER_YEAR) + 100
+        # Birth dasha remainder chosen so the years past it land exactly on the boundary
+        remaining_at_birth = elapsed_days / DAYS_PER_YEAR - boundary_years
+        assert elapsed_days / DAYS_PER_YEAR - remaining_at_birth == boundary_years
+        assert_matches_reference(monkeypatch, ruling_planet, remaining_at_birth, elapsed_days)
+        assert_matches_reference(monkeypatch, ruling_planet, remaining_at_birth, elapsed_days + 1)
+
+
+def test_random_spans_match_reference(monkeypatch):
+    """Random birth dashas and elapsed spans, up to several 120-year cycles"""
+    rng = random.Random(20240601)
+    for _ in range(2000):
+        ruling_planet = rng.choice(VimshottariDashaCalculator.PLANET_SEQUENCE)
+        remaining_at_birth = rng.uniform(0, VimshottariDashaCalculator.DASHA_PERIODS[ruling_planet])
+        elapsed_days = rng.randint(1, int(400 * DAYS_PER_YEAR))
+        assert_matches_reference(monkeypatch, ruling_planet, remaining_at_birth, elapsed_days)
+
+
+def test_birth_dasha_still_running(monkeypatch):
+    result = current_dasha(monkeypatch, 'Venus', 12.5, int(10 * DAYS_PER_YEAR))
+
+    assert result['current_planet'] == 'Venus'
+    assert result['remaining_years'] == pytest.approx(12.5 - int(10 * DAYS_PER_YEAR) / DAYS_PER_YEAR)
@@ -0,0 +1,59 @@
+"""
+Bisect lookups for the current and upcoming affliction periods, against the linear scans they replaced
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from src.calculations.planetary_afflictions import PlanetaryAfflictionsCalculator
+
+BASE_DATE = datetime(1990, 1, 1)
+
+
+def make_periods(rng, count):
+    """Non-overlapping periods in start order, with a gap of at least a day between them"""
+    periods, start = [], BASE_DATE + timedelta(days=rng.randint(0, 30))
+    for _ in range(count):
+        end = start + timedelta(days=rng.randint(0, 1000))
+        periods.append({'start_date': start, 'end_date': end})
+        start = end + timedelta(days=rng.randint(1, 3000))
+    return periods
+
+
+def probe_dates(rng, periods):
+    """Every period boundary, the days either side of it, and some random dates"""
+    dates = [BASE_DATE - timedelta(days=1)]
+    for period in periods:
+        for boundary in (period['start_date'], period['end_date']):
+            dates += [boundary - timedelta(days=1), boundary, boundary + timedelta(days=1)]
+    dates += [BASE_DATE + timedelta(days=rng.randint(0, 40000)) for _ in range(20)]
+    return dates
+
+
+def test_active_period_matches_linear_scan():
+    rng = random.Random(11)
+    for count in (0, 1, 2, 5, 12):
+        periods = make_periods(rng, count)
+        for current_date in probe_dates(rng, periods):
+            expected = [period for period in periods if period['start_date'] <= current_date <= period['end_date']]
+            active = PlanetaryAfflictionsCalculator._active_period(periods, current_date)
+            assert (expected[0] if expected else None) is active
+
+
+def test_periods_starting_between_matches_linear_scan():
+    rng = random.Random(23)
+    for count in (0, 1, 2, 5, 12):
+        periods = make_periods(rng, count)
+        dates = probe_dates(rng, periods)
+        for after in dates:
+            for until in rng.sample(dates, min(len(dates), 8)) + [after]:
+                expected = [period for period in periods if after < period['start_date'] <= until]
+                assert PlanetaryAfflictionsCalculator._periods_starting_between(periods, after, until) == expected
+
+
+def test_single_day_period_is_active_on_its_day():
+    day = datetime(2025, 3, 29)
+    periods = [{'start_date': day, 'end_date': day}]
+
+    assert PlanetaryAfflictionsCalculator._active_period(periods, day) is periods[0]
+    assert PlanetaryAfflictionsCalculator._active_period(periods, day + timedelta(seconds=1)) is None
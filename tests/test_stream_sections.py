@@ -0,0 +1,87 @@
+"""
+Splitting one streamed AI response into section streams on a marker
+"""
+
+import random
+
+import pytest
+
+from src.utils.common import split_stream_sections
+
+MARKER = "===SECTION==="
+
+
+def collect(chunks, count, marker=MARKER):
+    """Consume each section stream in order and join its pieces"""
+    return ["".join(section) for section in split_stream_sections(chunks, count, marker)]
+
+
+def expected_sections(text, count, marker=MARKER):
+    parts = text.split(marker, count - 1)
+    return parts + [""] * (count - len(parts))
+
+
+def chunked(text, sizes):
+    chunks, position = [], 0
+    for size in sizes:
+        chunks.append(text[position:position + size])
+        position += size
+    chunks.append(text[position:])
+    return chunks
+
+
+def test_marker_split_at_every_position():
+    text = f"first part{MARKER}second part{MARKER}third part"
+    split_at = text.index(MARKER)
+    for offset in range(len(MARKER) + 1):
+        chunks = [text[:split_at + offset], text[split_at + offset:]]
+        assert collect(chunks, 3) == ["first part", "second part", "third part"]
+
+
+def test_single_character_chunks():
+    text = f"a{MARKER}b{MARKER}c"
+    assert collect(list(text), 3) == ["a", "b", "c"]
+
+
+def test_random_chunking_matches_split():
+    rng = random.Random(7)
+    pieces = ["Gemstone", " ", "=", "==", "===SEC", "TION", MARKER, "\n", "mantra", "===SECTION=="]
+    for _ in range(500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        sizes = [rng.randint(1, 6) for _ in range(rng.randint(0, 10))]
+        for count in (1, 2, 4):
+            assert collect(chunked(text, sizes), count) == expected_sections(text, count)
+
+
+def test_missing_marker_leaves_later_sections_empty():
+    assert collect(["only ", "one section"], 3) == ["only one section", "", ""]
+
+
+def test_last_section_keeps_extra_markers():
+    text = f"a{MARKER}b{MARKER}c"
+    assert collect([text], 2) == ["a", f"b{MARKER}c"]
+
+
+def test_marker_prefix_is_not_held_back_for_good():
+    assert collect(["text ===SEC", "TOR ends"], 2) == ["text ===SECTOR ends", ""]
+
+
+def test_text_is_streamed_before_the_marker_arrives():
+    def chunks():
+        yield "quick insight "
+        yield "continues"
+        raise AssertionError("stream read past what the first section needed")
+
+    first, _ = split_stream_sections(chunks(), 2, MARKER)
+    assert next(first) == "quick insight "[:-(len(MARKER) - 1)]
+
+
+def test_stream_errors_propagate():
+    def chunks():
+        yield f"intro{MARKER}partial"
+        raise ConnectionError("stream dropped")
+
+    first, second = split_stream_sections(chunks(), 2, MARKER)
+    assert "".join(first) == "intro"
+    with pytest.raises(ConnectionError):
+        "".join(second)